@@ -0,0 +1,96 @@
+import numpy as np
+
+
+REDUCERS = ('mean', 'min', 'max', 'median')
+
+
+def parse_reducer(name):
+    """
+    Check the name of a reducer: 'mean', 'min', 'max', 'median' or 'q' followed by a quantile, as in 'q0.25'.
+
+    Args:
+        - name (str): Name of the reducer.
+
+    Returns:
+        - str: The name.
+
+    Raises:
+        - ValueError: If the name is not a known reducer or the quantile is not in [0, 1].
+    """
+    if name in REDUCERS:
+        return name
+    if name.startswith('q'):
+        try:
+            q = float(name[1:])
+        except ValueError:
+            q = -1.0
+        if 0.0 <= q <= 1.0:
+            return name
+    raise ValueError(f"Unknown reducer {name!r}, use one of {', '.join(REDUCERS)} or q<quantile>")
+
+
+class FitnessAggregator:
+    """
+    Combines the fitness of every genome over several episodes, as the episodes finish.
+
+    Episodes can arrive in any order and cover any subset of the genomes. Mean, min
+    and max keep a running value per genome. Median and quantiles need every value, so
+    they keep the episode fitness of every genome, one float per episode.
+    """
+
+    def __init__(self, n_genomes, reducer='mean'):
+        """
+        Initialize an empty aggregate.
+
+        Args:
+            - n_genomes (int): Number of genomes.
+            - reducer (str, optional): How episodes are combined, see parse_reducer (default is 'mean').
+        """
+        self.reducer = parse_reducer(reducer)
+        self.count = np.zeros(n_genomes, dtype=int)
+
+        if self.reducer == 'mean':
+            self.value = np.zeros(n_genomes)
+        elif self.reducer == 'min':
+            self.value = np.full(n_genomes, np.inf)
+        elif self.reducer == 'max':
+            self.value = np.full(n_genomes, -np.inf)
+        else:
+            self.values = [[] for _ in range(n_genomes)]
+
+    def add(self, fitness, rows=None):
+        """
+        Add the fitness of one episode.
+
+        Args:
+            - fitness (np.ndarray): Fitness of the genomes that played the episode.
+            - rows (np.ndarray, optional): Indices of those genomes, None for all of them.
+        """
+        if rows is None:
+            rows = np.arange(len(self.count))
+        rows = np.asarray(rows)
+        fitness = np.asarray(fitness, dtype=float)
+
+        self.count[rows] += 1
+        if self.reducer == 'mean':
+            self.value[rows] += fitness
+        elif self.reducer == 'min':
+            self.value[rows] = np.minimum(self.value[rows], fitness)
+        elif self.reducer == 'max':
+            self.value[rows] = np.maximum(self.value[rows], fitness)
+        else:
+            for row, value in zip(rows, fitness):
+                self.values[row].append(value)
+
+    def result(self):
+        """
+        Returns:
+            - np.ndarray: The combined fitness of every genome, NaN for genomes with no episode.
+        """
+        if self.reducer == 'mean':
+            return np.where(self.count > 0, self.value / np.maximum(self.count, 1), np.nan)
+        if self.reducer in ('min', 'max'):
+            return np.where(self.count > 0, self.value, np.nan)
+
+        q = 0.5 if self.reducer == 'median' else float(self.reducer[1:])
+        return np.array([np.quantile(values, q) if values else np.nan for values in self.values])
@@ -0,0 +1,129 @@
+import os
+import struct
+from collections import OrderedDict
+
+import pygame
+
+
+# Variable
+FLAPPY_DIRECTORY = os.path.join('.', 'Src', 'flappy')
+
+# Sizes of the shipped images, so the simulation never decodes them
+IMAGE_SIZES = {
+    os.path.normpath(os.path.join(FLAPPY_DIRECTORY, 'base', 'base.png')): (336, 112),
+    os.path.normpath(os.path.join(FLAPPY_DIRECTORY, 'base', 'bg.png')): (288, 512),
+    os.path.normpath(os.path.join(FLAPPY_DIRECTORY, 'base', 'bg2.png')): (576, 512),
+    os.path.normpath(os.path.join(FLAPPY_DIRECTORY, 'bird', 'bird0.png')): (34, 24),
+    os.path.normpath(os.path.join(FLAPPY_DIRECTORY, 'bird', 'bird1.png')): (34, 24),
+    os.path.normpath(os.path.join(FLAPPY_DIRECTORY, 'bird', 'bird2.png')): (34, 24),
+    os.path.normpath(os.path.join(FLAPPY_DIRECTORY, 'bird', 'bird3.png')): (34, 24),
+    os.path.normpath(os.path.join(FLAPPY_DIRECTORY, 'pipe', 'pipe.png')): (52, 320),
+    os.path.normpath(os.path.join(FLAPPY_DIRECTORY, 'pipe', 'pipe2.png')): (52, 320),
+}
+
+PNG_HEADER = struct.Struct('>8s4x4sII')  # signature, chunk length, IHDR, width, height
+
+_images = {}  # Loaded surfaces, by path
+_converted = set()  # Paths whose surface is in the display format
+
+
+def image_size(path):
+    """
+    Get the size of an image without decoding it.
+
+    Shipped images are looked up in IMAGE_SIZES, other PNG files have their header read.
+
+    Args:
+        - path (str): Path of the image file.
+
+    Returns:
+        - tuple: Width and height of the image.
+
+    Raises:
+        - ValueError: If the image is not in IMAGE_SIZES and is not a PNG file.
+    """
+    size = IMAGE_SIZES.get(os.path.normpath(path))
+    if size is not None:
+        return size
+
+    with open(path, 'rb') as f:
+        signature, chunk, width, height = PNG_HEADER.unpack(f.read(PNG_HEADER.size))
+    if signature != b'\x89PNG\r\n\x1a\n' or chunk != b'IHDR':
+        raise ValueError(f"{path} is not a PNG file")
+    return width, height
+
+
+def get_image(path):
+    """
+    Get an image, loading it on first use (usually the first draw) and converting it to the
+    display format once a display exists.
+
+    Converted surfaces blit without a per-pixel format conversion. Images with an alpha
+    channel go through convert_alpha(), the others through convert().
+
+    Args:
+        - path (str): Path of the image file.
+
+    Returns:
+        - pygame.Surface: The image.
+    """
+    surface = _images.get(path)
+    if surface is None:
+        surface = _images[path] = pygame.image.load(path)
+
+    if path not in _converted and pygame.display.get_surface() is not None:
+        if surface.get_flags() & pygame.SRCALPHA:
+            surface = surface.convert_alpha()
+        else:
+            surface = surface.convert()
+        _images[path] = surface
+        _converted.add(path)
+
+    return surface
+
+
+class TextCache:
+    """
+    A least-recently-used cache of rendered text surfaces.
+
+    HUD lines such as 'Score: 3' only change when their value does, so they are
+    rendered once and then blitted from the cache.
+    """
+
+    def __init__(self, font, color, capacity=128):
+        """
+        Initialize an empty cache.
+
+        Args:
+            - font (pygame.font.Font): Font of the text.
+            - color (tuple): RGB color of the text.
+            - capacity (int, optional): Maximum number of cached surfaces (default is 128).
+        """
+        self.font = font
+        self.color = color
+        self.capacity = capacity
+        self.surfaces = OrderedDict()
+
+    def render(self, text):
+        """
+        Get the surface of a text, rendering it on a miss.
+
+        Args:
+            - text (str): The text.
+
+        Returns:
+            - pygame.Surface: The rendered text.
+        """
+        surface = self.surfaces.get(text)
+        if surface is not None:
+            self.surfaces.move_to_end(text)
+            return surface
+
+        surface = self.font.render(text, True, self.color)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+
+        self.surfaces[text] = surface
+        if len(self.surfaces) > self.capacity:
+            self.surfaces.popitem(last=False)
+        return surface
@@ -1,5 +1,4 @@
 import os
-import pygame
 
+# Variable
 BACKGROUND_IMAGE = os.path.join('.', 'Src', 'flappy', 'base', 'bg.png')
-background_image = pygame.image.load(BACKGROUND_IMAGE)
@@ -1,21 +1,25 @@
 import os
-import time
 import pygame
-from PIL import Image
 
 
 # Variable
-from ..constant import WINDOW_HEIGHT, WINDOW_WIDTH
+from .assets import get_image, image_size
+from ..constant import WINDOW_HEIGHT, WINDOW_WIDTH, DT_SECONDS
 BIRD_DIRECTORY = os.path.join('.', 'Src', 'flappy', 'bird')
 BIRD_FILENAMES = ['bird0.png', 'bird1.png', 'bird2.png', 'bird3.png']
 BIRD_IMAGES = [os.path.join(BIRD_DIRECTORY, filename) for filename in BIRD_FILENAMES]
-bird_size = Image.open(BIRD_IMAGES[0]).size
-bird_images = [pygame.image.load(image) for image in BIRD_IMAGES]
+bird_size = image_size(BIRD_IMAGES[0])
 
 class Player:
     """
     A class representing the player (bird) in the Flappy Bird game.
     """
+    __slots__ = ('x_velocity', 'image_index', 'position', 'velocity_y', 'jump_strength', 'gravity',
+                 'is_ground', 'time', 'last_flap_time', 'rect')
+
+    # Shared by every bird
+    size = bird_size
+    flap_interval = 0.5  # Interval threshold in seconds
 
     def __init__(self, start_y = 0):
         """
@@ -23,21 +27,21 @@ class Player:
         """
         self.x_velocity = 0
         self.image_index = 0
-        self.size = bird_size
         self.position = [(WINDOW_WIDTH - self.size[0]) // 2, WINDOW_HEIGHT // 4 + start_y]
         self.velocity_y = 5 + self.x_velocity
         self.jump_strength = -35
         self.gravity = 22
         self.is_ground = False
 
-        self.last_flap_time = 0  # Time of the last flap
-        self.flap_interval = 0.5  # Interval threshold in seconds
+        self.time = 0.0  # Simulation time in seconds, advanced by update()
+        self.last_flap_time = float('-inf')  # Time of the last flap
+        self.rect = pygame.Rect(self.position, self.size)
 
     def flap_up(self):
         """
-        Make the bird flap upward.
+        Make the bird flap upward, chaining the jump if the last flap is within flap_interval of simulation time.
         """
-        current_time = time.time()
+        current_time = self.time
         if current_time - self.last_flap_time < self.flap_interval:
             self.jump_strength -= 0.6
         else:
@@ -51,9 +55,11 @@ class Player:
         Get the rectangular area occupied by the bird.
 
         Returns:
-            pygame.Rect: A pygame Rect object representing the bird's position and size.
+            pygame.Rect: A pygame Rect object representing the bird's position and size, updated in place.
         """
-        return pygame.Rect(self.position, (self.size[0], self.size[1]))
+        self.rect.x = int(self.position[0])
+        self.rect.y = int(self.position[1])
+        return self.rect
 
     def draw(self, screen):
         """
@@ -61,15 +67,20 @@ class Player:
 
         Args:
             screen (pygame.Surface): The surface to draw the bird on.
+
+        Returns:
+            pygame.Rect: The area of the screen that was drawn.
         """
         if self.velocity_y < 0:
             player_rect = self.get_rect()
-            current_image = bird_images[self.image_index]
-            screen.blit(current_image, player_rect)
-            self.image_index = (self.image_index + 1) % len(bird_images)
+            current_image = get_image(BIRD_IMAGES[self.image_index])
+            drawn = screen.blit(current_image, player_rect)
+            self.image_index = (self.image_index + 1) % len(BIRD_IMAGES)
 
         else:
-            screen.blit(bird_images[self.image_index], self.get_rect())
+            drawn = screen.blit(get_image(BIRD_IMAGES[self.image_index]), self.get_rect())
+
+        return drawn
 
     def update(self, dt):
         """
@@ -78,6 +89,7 @@ class Player:
         Args:
             dt (float): Time delta since the last update.
         """
+        self.time += dt * DT_SECONDS
         y = self.position[1]
 
         # Check lower border and ground condition
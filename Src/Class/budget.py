@@ -0,0 +1,67 @@
+class EpisodeBudget:
+    """
+    Limits on the length of an episode, so a generation cannot run forever.
+
+    An episode stops when it reaches max_frames frames, max_pipes passed pipes or
+    max_seconds of wall time, or when every living bird is stuck: it touched the
+    ground stuck_contacts times without flapping in between, bouncing on the floor
+    under physics alone. Any limit left to None is not checked.
+    """
+
+    def __init__(self, max_frames=None, max_pipes=None, max_seconds=None, stuck_contacts=None, extrapolate=False):
+        """
+        Initialize the budget.
+
+        Args:
+            - max_frames (int, optional): Maximum number of frames of an episode.
+            - max_pipes (int, optional): Maximum number of pipes passed in an episode.
+            - max_seconds (float, optional): Maximum wall time of an episode, in seconds.
+            - stuck_contacts (int, optional): Ground contacts without a flap after which a bird is stuck.
+            - extrapolate (bool, optional): Scale the fitness of the survivors up to max_frames instead
+              of capping it, unless they are stuck (default is False).
+        """
+        self.max_frames = max_frames
+        self.max_pipes = max_pipes
+        self.max_seconds = max_seconds
+        self.stuck_contacts = stuck_contacts
+        self.extrapolate = extrapolate
+        self.stops = {}  # Number of episodes stopped early, by reason
+
+    def exhausted(self, frame, pipes, seconds, ground_contacts):
+        """
+        Check whether the episode must stop.
+
+        Args:
+            - frame (int): Number of frames played.
+            - pipes (int): Number of pipes passed.
+            - seconds (float): Wall time of the episode so far.
+            - ground_contacts (np.ndarray): Ground contacts since the last flap of every living bird.
+
+        Returns:
+            - str: The exhausted limit ('frames', 'pipes', 'seconds' or 'stuck'), None to keep playing.
+        """
+        if self.max_frames is not None and frame >= self.max_frames:
+            return 'frames'
+        if self.max_pipes is not None and pipes >= self.max_pipes:
+            return 'pipes'
+        if self.max_seconds is not None and seconds >= self.max_seconds:
+            return 'seconds'
+        if self.stuck_contacts is not None and len(ground_contacts) > 0 and (ground_contacts >= self.stuck_contacts).all():
+            return 'stuck'
+        return None
+
+    def settle(self, fitness, alive, frame, reason):
+        """
+        Record an early stop and adjust the fitness of the birds still alive.
+
+        Args:
+            - fitness (np.ndarray): The fitness of every bird, updated in place.
+            - alive (np.ndarray): Boolean array of the birds still alive.
+            - frame (int): Number of frames played.
+            - reason (str): The exhausted limit, as returned by exhausted().
+        """
+        self.stops[reason] = self.stops.get(reason, 0) + 1
+
+        # Survivors keep the rate they scored at for the frames they did not play
+        if self.extrapolate and reason != 'stuck' and self.max_frames is not None and frame < self.max_frames:
+            fitness[alive] *= self.max_frames / max(frame, 1)
@@ -0,0 +1,180 @@
+import json
+import math
+
+
+CHAMPION_FORMAT = 'flippy-champion'
+CHAMPION_VERSION = 1
+
+
+# Funzioni di attivazione e aggregazione, con le stesse formule di neat-python
+def _sigmoid(z):
+    z = max(-60.0, min(60.0, 5.0 * z))
+    return 1.0 / (1.0 + math.exp(-z))
+
+
+def _tanh(z):
+    return math.tanh(max(-60.0, min(60.0, 2.5 * z)))
+
+
+def _sin(z):
+    return math.sin(max(-60.0, min(60.0, 5.0 * z)))
+
+
+def _gauss(z):
+    z = max(-3.4, min(3.4, z))
+    return math.exp(-5.0 * z ** 2)
+
+
+def _relu(z):
+    return z if z > 0.0 else 0.0
+
+
+def _clamped(z):
+    return max(-1.0, min(1.0, z))
+
+
+def _product(values):
+    result = 1.0
+    for value in values:
+        result *= value
+    return result
+
+
+def _mean(values):
+    return sum(values) / len(values)
+
+
+# Identity is written inline, sum as a chain of additions
+ACTIVATIONS = {'sigmoid': _sigmoid, 'tanh': _tanh, 'sin': _sin, 'gauss': _gauss, 'relu': _relu,
+               'clamped': _clamped, 'abs': abs, 'identity': None}
+AGGREGATIONS = {'product': _product, 'max': max, 'min': min, 'mean': _mean, 'sum': None}
+
+
+def check_champion(champion):
+    """
+    Validate a flattened network and coerce every value to its type, before any source is generated.
+
+    Args:
+        - champion (dict): The flattened network, as written by export_champion.
+
+    Returns:
+        - dict: A clean copy with only the fields that generate_source reads.
+
+    Raises:
+        - ValueError: If the format is unknown, a value has the wrong type or is not finite, or a node
+          reads a slot that is neither an input nor an earlier node.
+    """
+    try:
+        if champion.get('format') != CHAMPION_FORMAT or champion.get('version') != CHAMPION_VERSION:
+            raise ValueError('Not a champion network, or written by an unsupported version')
+
+        n_inputs = int(champion['inputs'])
+        if n_inputs < 1:
+            raise ValueError('A champion network needs at least one input')
+
+        nodes = []
+        for slot, node in enumerate(champion['nodes'], n_inputs):
+            activation, aggregation = node['activation'], node['aggregation']
+            if not isinstance(activation, str) or activation not in ACTIVATIONS or \
+                    not isinstance(aggregation, str) or aggregation not in AGGREGATIONS:
+                raise ValueError(f"Unsupported node {activation}/{aggregation}")
+
+            sources = [int(source) for source in node['sources']]
+            weights = [float(weight) for weight in node['weights']]
+            bias, response = float(node['bias']), float(node['response'])
+            if len(sources) != len(weights):
+                raise ValueError(f"Node in slot {slot} has {len(sources)} sources and {len(weights)} weights")
+            if any(not 0 <= source < slot for source in sources):
+                raise ValueError(f"Node in slot {slot} reads a slot that is not evaluated before it")
+            if not all(math.isfinite(value) for value in weights + [bias, response]):
+                raise ValueError(f"Node in slot {slot} has a value that is not finite")
+
+            nodes.append({'activation': activation, 'aggregation': aggregation, 'bias': bias,
+                          'response': response, 'sources': sources, 'weights': weights})
+
+        n_slots = n_inputs + len(nodes)
+        outputs = [None if slot is None else int(slot) for slot in champion['outputs']]
+        if any(slot is not None and not 0 <= slot < n_slots for slot in outputs):
+            raise ValueError('An output reads a slot that does not exist')
+
+    except (KeyError, TypeError, AttributeError) as e:
+        raise ValueError(f"Malformed champion network: {e!r}") from e
+
+    return {'inputs': n_inputs, 'outputs': outputs, 'nodes': nodes}
+
+
+def generate_source(champion):
+    """
+    Generate the Python source of the activate function of a champion network.
+
+    Every node becomes one assignment in topological order, with its weights written
+    as literals, so a forward pass is a handful of float operations and no lookups.
+    The network is validated first, so only numbers and known names reach the source.
+
+    Args:
+        - champion (dict): The flattened network, as written by export_champion.
+
+    Returns:
+        - str: The source of a function activate(inputs) returning the list of outputs.
+
+    Raises:
+        - ValueError: If the network does not pass check_champion.
+    """
+    champion = check_champion(champion)
+    n_inputs = champion['inputs']
+    lines = ['def activate(inputs):']
+    lines.append('    ' + ''.join(f'v{i}, ' for i in range(n_inputs)) + '= inputs')
+
+    for slot, node in enumerate(champion['nodes'], n_inputs):
+        terms = [f'v{source} * {weight!r}' for source, weight in zip(node['sources'], node['weights'])]
+        if node['aggregation'] == 'sum':
+            total = ' + '.join(terms) if terms else '0.0'
+        else:
+            total = f"{node['aggregation']}(({''.join(term + ', ' for term in terms)}))"
+        z = f"{node['bias']!r} + {node['response']!r} * ({total})"
+        lines.append(f"    v{slot} = {z}" if node['activation'] == 'identity' else f"    v{slot} = {node['activation']}({z})")
+
+    outputs = ['0.0' if slot is None else f'v{slot}' for slot in champion['outputs']]
+    lines.append(f"    return [{', '.join(outputs)}]")
+    return '\n'.join(lines) + '\n'
+
+
+class Champion:
+    """
+    A trained network exported by export_champion, run with plain Python and no neat-python.
+
+    The network is loaded from a small JSON file and compiled into a generated Python
+    function, which gives the same outputs as neat.nn.FeedForwardNetwork.activate.
+    """
+
+    def __init__(self, champion):
+        """
+        Compile a flattened network.
+
+        Args:
+            - champion (dict): The flattened network, as written by export_champion.
+
+        Raises:
+            - ValueError: If the network does not pass check_champion.
+        """
+        self.source = generate_source(champion)
+        self.n_inputs = int(champion['inputs'])
+        self.n_outputs = len(champion['outputs'])
+
+        namespace = {name: function for name, function in {**ACTIVATIONS, **AGGREGATIONS}.items() if function is not None}
+        exec(compile(self.source, '<champion>', 'exec'), namespace)
+        self.activate = namespace['activate']
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load an exported network.
+
+        Args:
+            - path (str): The champion file.
+
+        Returns:
+            - Champion: The compiled network, call its activate(inputs) method.
+        """
+        with open(path) as f:
+            return cls(json.load(f))
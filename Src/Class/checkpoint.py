@@ -0,0 +1,322 @@
+import io
+import os
+import gzip
+import queue
+import pickle
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import neat
+
+
+def _genomes_of(population, species_set):
+    """
+    Collect every genome reachable from a population and its species, by key.
+
+    Args:
+        - population (dict): The genomes of the population, by key.
+        - species_set (neat.DefaultSpeciesSet): The species of the population.
+
+    Returns:
+        - dict: The genomes, by key.
+    """
+    genomes = dict(population)
+    for species in species_set.species.values():
+        genomes.update(species.members)
+        if species.representative is not None:
+            genomes[species.representative.key] = species.representative
+    return genomes
+
+
+class _DeltaPickler(pickle.Pickler):
+    """
+    A pickler that stores genomes of the base checkpoint as references to their key.
+    """
+
+    def __init__(self, file, base):
+        """
+        Args:
+            - file (io.BufferedIOBase): Destination of the pickle.
+            - base (dict): The genomes of the base checkpoint, by key.
+        """
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.base = base
+
+    def persistent_id(self, obj):
+        """
+        Returns:
+            - int: The key of obj if it is a genome of the base checkpoint, None to pickle it normally.
+        """
+        if isinstance(obj, neat.DefaultGenome) and self.base.get(obj.key) is obj:
+            return obj.key
+        return None
+
+
+class _DeltaUnpickler(pickle.Unpickler):
+    """
+    An unpickler that resolves genome references against the genomes of the base checkpoint.
+    """
+
+    def __init__(self, file, base):
+        """
+        Args:
+            - file (io.BufferedIOBase): Source of the pickle.
+            - base (dict): The genomes of the base checkpoint, by key.
+        """
+        super().__init__(file)
+        self.base = base
+
+    def persistent_load(self, key):
+        """
+        Returns:
+            - neat.DefaultGenome: The genome of the base checkpoint with this key.
+        """
+        return self.base[key]
+
+
+class AsyncCheckpointer(neat.Checkpointer):
+    """
+    A checkpointer that compresses and writes checkpoints in a background thread.
+
+    The state is pickled on the training thread, so the snapshot is consistent, and a
+    writer thread gzips it to a temporary file and renames it into place. Only the last
+    `keep` checkpoints are kept. In incremental mode, only every `full_interval`-th
+    checkpoint holds the whole population; the others store just the genomes that are
+    not in the last full checkpoint and refer to it for the rest.
+
+    Full checkpoints use the same format as neat.Checkpointer.
+    """
+
+    def __init__(self, generation_interval=100, time_interval_seconds=300,
+                 filename_prefix='neat-checkpoint-', keep=3, incremental=False, full_interval=5):
+        """
+        Initialize the checkpointer, the writer thread starts with the first checkpoint.
+
+        Args:
+            - generation_interval (int, optional): Generations between checkpoints (default is 100).
+            - time_interval_seconds (float, optional): Seconds between checkpoints (default is 300).
+            - filename_prefix (str, optional): Prefix of the file names, followed by the generation.
+            - keep (int, optional): Number of checkpoints kept on disk (default is 3).
+            - incremental (bool, optional): Store only the changed genomes between full checkpoints (default is False).
+            - full_interval (int, optional): In incremental mode, checkpoints per full checkpoint (default is 5).
+        """
+        super().__init__(generation_interval, time_interval_seconds, filename_prefix)
+        self.keep = keep
+        self.incremental = incremental
+        self.full_interval = full_interval
+
+        self.saved = []  # (filename, base filename or None), oldest first
+        self.base_filename = None
+        self.base_genomes = {}
+        self.n_saved = 0
+
+        # The writer thread starts with the first checkpoint
+        self.jobs = queue.Queue()
+        self.writer = None
+        self.error = None  # First write error, raised by the next flush()
+
+    def __getstate__(self):
+        """
+        Pickle the settings of the checkpointer without its writer thread, since the
+        species set of every checkpoint refers to the reporters of the population.
+
+        Returns:
+            - dict: The attributes that can be pickled.
+        """
+        state = self.__dict__.copy()
+        for name in ('jobs', 'writer', 'base_genomes', 'error'):
+            del state[name]
+        return state
+
+    def __setstate__(self, state):
+        """
+        Restore an unpickled checkpointer with no writer thread and no full checkpoint to refer to.
+
+        Args:
+            - state (dict): The attributes returned by __getstate__.
+        """
+        self.__dict__.update(state)
+        self.base_filename = None
+        self.base_genomes = {}
+        self.jobs = queue.Queue()
+        self.writer = None
+        self.error = None
+
+    def save_checkpoint(self, config, population, species_set, generation, filename=None):
+        """
+        Snapshot the current simulation state and queue it for writing.
+
+        Args:
+            - config (neat.Config): The NEAT configuration.
+            - population (dict): The genomes of the population, by key.
+            - species_set (neat.DefaultSpeciesSet): The species of the population.
+            - generation (int): The generation of the snapshot.
+            - filename (str, optional): Destination file, None for the prefix followed by the generation.
+        """
+        if filename is None:
+            filename = '{0}{1}'.format(self.filename_prefix, generation)
+        print("Saving checkpoint to {0}".format(filename))
+
+        data = (generation, config, population, species_set, random.getstate())
+        full = not self.incremental or self.base_filename is None or self.n_saved % self.full_interval == 0
+        self.n_saved += 1
+
+        if full:
+            payload = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+            self.base_filename = filename
+            self.base_genomes = _genomes_of(population, species_set)
+            base = None
+        else:
+            buffer = io.BytesIO()
+            _DeltaPickler(buffer, self.base_genomes).dump(data)
+            payload = pickle.dumps(('delta', self.base_filename, buffer.getvalue()), protocol=pickle.HIGHEST_PROTOCOL)
+            base = self.base_filename
+
+        if self.writer is None:
+            self.writer = threading.Thread(target=self._write_loop, daemon=True)
+            self.writer.start()
+        self.jobs.put((filename, base, payload))
+
+    def flush(self):
+        """
+        Wait until every queued checkpoint is written or has failed.
+
+        Raises:
+            - OSError: The first error of the writer thread since the last flush, if any.
+        """
+        self.jobs.join()
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def close(self):
+        """
+        Write the queued checkpoints and stop the writer thread.
+
+        Raises:
+            - OSError: The first error of the writer thread since the last flush, if any.
+        """
+        try:
+            self.flush()
+        finally:
+            if self.writer is not None:
+                self.jobs.put(None)
+                self.writer.join()
+                self.writer = None
+
+    def _write_loop(self):
+        """
+        Compress and write queued checkpoints until close() is called.
+        """
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                self.jobs.task_done()
+                return
+
+            filename, base, payload = job
+            temporary = filename + '.tmp'
+            try:
+                with gzip.open(temporary, 'wb', compresslevel=5) as f:
+                    f.write(payload)
+                os.replace(temporary, filename)
+
+                self.saved = [entry for entry in self.saved if entry[0] != filename] + [(filename, base)]
+                self._rotate()
+            except Exception as e:
+                # The thread keeps running, the error is raised on the training thread by flush()
+                if self.error is None:
+                    self.error = e
+                if os.path.exists(temporary):
+                    os.remove(temporary)
+            finally:
+                self.jobs.task_done()
+
+    def _rotate(self):
+        """
+        Delete old checkpoints, keeping the last `keep` ones and the full checkpoints they refer to.
+        """
+        kept = self.saved[-self.keep:]
+        needed = {filename for filename, base in kept} | {base for filename, base in kept if base is not None}
+
+        for filename, base in self.saved:
+            if filename not in needed and os.path.exists(filename):
+                os.remove(filename)
+        self.saved = [entry for entry in self.saved if entry[0] in needed]
+
+    @staticmethod
+    def load_checkpoint(filename):
+        """
+        Read a full or incremental checkpoint.
+
+        Args:
+            - filename (str): The checkpoint file.
+
+        Returns:
+            - tuple: generation, config, population, species_set and random state.
+        """
+        with gzip.open(filename) as f:
+            data = pickle.load(f)
+
+        if data[0] != 'delta':
+            return data
+
+        # Incremental checkpoints resolve unchanged genomes against their full checkpoint
+        base_filename, payload = data[1], data[2]
+        base_data = AsyncCheckpointer.load_checkpoint(base_filename)
+        base = _genomes_of(base_data[2], base_data[3])
+        return _DeltaUnpickler(io.BytesIO(payload), base).load()
+
+    @staticmethod
+    def prefetch_checkpoint(filename, network_cache=None):
+        """
+        Start reading a checkpoint in a background thread, so the caller can set up meanwhile.
+
+        Args:
+            - filename (str): The checkpoint file.
+            - network_cache (NetworkCache, optional): Cache to fill with the networks of the restored genomes.
+
+        Returns:
+            - concurrent.futures.Future: The state returned by load_checkpoint, pass it to population_from().
+        """
+        def load():
+            state = AsyncCheckpointer.load_checkpoint(filename)
+            if network_cache is not None:
+                config, population = state[1], state[2]
+                for genome in population.values():
+                    network_cache.get(genome, config)
+            return state
+
+        executor = ThreadPoolExecutor(max_workers=1)
+        future = executor.submit(load)
+        executor.shutdown(wait=False)
+        return future
+
+    @staticmethod
+    def population_from(state):
+        """
+        Build the population of a loaded checkpoint and restore its random state.
+
+        Args:
+            - state (tuple): generation, config, population, species_set and random state.
+
+        Returns:
+            - neat.Population: The restored population.
+        """
+        generation, config, population, species_set, rndstate = state
+        random.setstate(rndstate)
+        return neat.Population(config, (population, species_set, generation))
+
+    @staticmethod
+    def restore_checkpoint(filename):
+        """
+        Resume the simulation from a full or incremental checkpoint.
+
+        Args:
+            - filename (str): The checkpoint file.
+
+        Returns:
+            - neat.Population: The restored population.
+        """
+        return AsyncCheckpointer.population_from(AsyncCheckpointer.load_checkpoint(filename))
@@ -0,0 +1,28 @@
+# Variable
+from ..constant import FIXED_DT
+
+
+class SimClock:
+    """
+    A fixed-timestep clock that steps the simulation by the same delta every frame instead of wall-clock time.
+
+    Simulation time is kept by the players, which advance it by the delta they are updated with.
+    """
+
+    def __init__(self, dt=FIXED_DT):
+        """
+        Initialize the clock.
+
+        Args:
+            - dt (float, optional): Time delta of every frame (default is FIXED_DT).
+        """
+        self.dt = dt
+
+    def tick(self):
+        """
+        Advance the clock by one frame.
+
+        Returns:
+            - float: The fixed time delta of the frame.
+        """
+        return self.dt
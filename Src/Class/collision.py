@@ -0,0 +1,82 @@
+import numpy as np
+
+# Variable
+from .pipe import pipe_width, pipe_height
+
+
+def tube_boxes(tube_list):
+    """
+    Get the integer top-left corners of both halves of every live tube, truncated like pygame.Rect.
+
+    Args:
+        - tube_list (TubeRing): The live tubes.
+
+    Returns:
+        - tuple of np.ndarray: Left and top coordinates, bottom halves first, then top halves.
+    """
+    tubes = list(tube_list)
+    left = np.array([tube.position[0] for tube in tubes] + [tube.position_rotate[0] for tube in tubes])
+    top = np.array([tube.position[1] for tube in tubes] + [tube.position_rotate[1] for tube in tubes])
+    return np.trunc(left), np.trunc(top)
+
+
+def collide(x, y, size, tube_list):
+    """
+    Check every bird against both halves of every live tube in one array operation.
+
+    A bird hits a tube half when their boxes overlap, as in pygame.Rect.colliderect.
+
+    Args:
+        - x (np.ndarray): Horizontal position of every bird.
+        - y (np.ndarray): Vertical position of every bird.
+        - size (tuple): Width and height of a bird.
+        - tube_list (TubeRing): The live tubes.
+
+    Returns:
+        - np.ndarray: Boolean array, True for the birds that hit a tube.
+    """
+    tube_left, tube_top = tube_boxes(tube_list)
+    return _overlap(x, y, size, tube_left, tube_top).any(axis=1)
+
+
+def collide_arrays(x, y, size, tube_x, tube_y, tube_y_rotate, live):
+    """
+    Check every bird against both halves of the tubes of its own world, given as arrays.
+
+    Args:
+        - x (np.ndarray): Horizontal position of every bird.
+        - y (np.ndarray): Vertical position of every bird.
+        - size (tuple): Width and height of a bird.
+        - tube_x (np.ndarray): Horizontal position of the tubes of every bird, of shape (n_birds, n_tubes).
+        - tube_y (np.ndarray): Top of the lower halves, same shape.
+        - tube_y_rotate (np.ndarray): Top of the upper halves, same shape.
+        - live (np.ndarray): Boolean array selecting the live tubes, same shape.
+
+    Returns:
+        - np.ndarray: Boolean array, True for the birds that hit a tube.
+    """
+    tube_left = np.trunc(np.concatenate((tube_x, tube_x), axis=1))
+    tube_top = np.trunc(np.concatenate((tube_y, tube_y_rotate), axis=1))
+    hit = _overlap(x, y, size, tube_left, tube_top) & np.concatenate((live, live), axis=1)
+    return hit.any(axis=1)
+
+
+def _overlap(x, y, size, tube_left, tube_top):
+    """
+    Test the boxes of the birds against truncated tube halves, like pygame.Rect.colliderect.
+
+    Args:
+        - x (np.ndarray): Horizontal position of every bird.
+        - y (np.ndarray): Vertical position of every bird.
+        - size (tuple): Width and height of a bird.
+        - tube_left (np.ndarray): Left of the tube halves, shared or one row per bird.
+        - tube_top (np.ndarray): Top of the tube halves, same shape.
+
+    Returns:
+        - np.ndarray: Boolean array of shape (n_birds, n_halves).
+    """
+    left = np.trunc(np.asarray(x, dtype=float))[:, None]
+    top = np.trunc(np.asarray(y, dtype=float))[:, None]
+
+    return ((left < tube_left + pipe_width) & (tube_left < left + size[0]) &
+            (top < tube_top + pipe_height) & (tube_top < top + size[1]))
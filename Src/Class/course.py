@@ -0,0 +1,172 @@
+import os
+import random
+import struct
+import tempfile
+from collections import OrderedDict
+
+import numpy as np
+
+# Variable
+COURSE_DIRECTORY = os.path.join('.', 'courses')
+COURSE_LENGTH = 1024  # Tubes generated up front, courses grow on demand
+COURSE_MAGIC = b'FBC1'
+COURSE_HEADER = struct.Struct('<4sqI')  # magic, seed, number of tubes
+MAX_DELTA = 180  # Tube gaps vary in [-MAX_DELTA, MAX_DELTA]
+MEMORY_CAPACITY = 256  # Courses kept in memory, least recently used first out
+
+_courses = OrderedDict()
+_directory = None  # Directory of the disk cache, None to keep courses in memory only
+
+
+def cache_courses_on_disk(directory=COURSE_DIRECTORY):
+    """
+    Keep a copy of every course used from now on in a directory, shared by processes and runs.
+
+    Args:
+        - directory (str, optional): Directory of the disk cache, None to turn it off (default is COURSE_DIRECTORY).
+    """
+    global _directory
+    _directory = directory
+
+
+def course_cache_directory():
+    """
+    Returns:
+        - str: Directory of the disk cache set with cache_courses_on_disk, None if courses stay in memory.
+    """
+    return _directory
+
+
+class Course:
+    """
+    A seeded, precomputed sequence of tube gap variations.
+
+    Tube k of a course always gets delta[k], the k-th draw of random.Random(seed),
+    so every world built on the same course sees the same pipes.
+    """
+
+    def __init__(self, seed, length=COURSE_LENGTH, delta=None):
+        """
+        Generate the course, or wrap already generated gaps.
+
+        Args:
+            - seed (int): Seed of the course.
+            - length (int, optional): Number of tubes to generate (default is COURSE_LENGTH).
+            - delta (np.ndarray, optional): Precomputed gap variations, as read from disk.
+        """
+        self.seed = seed
+        if delta is None:
+            rng = random.Random(seed)
+            delta = np.array([rng.randint(-MAX_DELTA, MAX_DELTA) for _ in range(length)], dtype='<i2')
+        self.delta = delta
+
+    def __len__(self):
+        """
+        Returns:
+            - int: Number of tubes generated so far.
+        """
+        return len(self.delta)
+
+    def __getitem__(self, index):
+        """
+        Get the gap variation of a tube, generating more of the course if needed.
+
+        Args:
+            - index (int): Index of the tube in the course.
+
+        Returns:
+            - int: The vertical variation of the tube.
+        """
+        if index >= len(self.delta):
+            # The generator is replayed from the seed, so the first tubes do not change
+            self.delta = Course(self.seed, max(2 * len(self.delta), index + 1)).delta
+        return int(self.delta[index])
+
+    def save(self, path):
+        """
+        Write the course to a compact binary file: a small header followed by one int16 per tube.
+
+        The file is written under a temporary name and renamed into place, so other
+        processes reading the same course never see a partial file.
+
+        Args:
+            - path (str): Destination file.
+        """
+        directory = os.path.dirname(path) or '.'
+        os.makedirs(directory, exist_ok=True)
+
+        fd, temporary = tempfile.mkstemp(dir=directory, prefix='.course-', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(COURSE_HEADER.pack(COURSE_MAGIC, self.seed, len(self.delta)))
+                f.write(self.delta.astype('<i2').tobytes())
+            os.replace(temporary, path)
+        except BaseException:
+            os.remove(temporary)
+            raise
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read a course written by save().
+
+        Args:
+            - path (str): Source file.
+
+        Returns:
+            - Course: The course.
+
+        Raises:
+            - ValueError: If the file is not a course file or is truncated.
+        """
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        try:
+            magic, seed, length = COURSE_HEADER.unpack_from(data)
+            delta = np.frombuffer(data, dtype='<i2', offset=COURSE_HEADER.size)
+        except (struct.error, ValueError):
+            raise ValueError(f"{path} is not a valid course file") from None
+        if magic != COURSE_MAGIC or len(delta) != length:
+            raise ValueError(f"{path} is not a valid course file")
+
+        return cls(seed, delta=delta.copy())
+
+
+def get_course(seed, directory=None):
+    """
+    Get a course from the in-memory cache, the disk cache, or by generating and caching it.
+
+    The last MEMORY_CAPACITY courses are kept in memory. Courses are only written to
+    disk when a directory is given or set with cache_courses_on_disk. A short or
+    corrupt file on disk is treated as a miss and written again.
+
+    Args:
+        - seed (int): Seed of the course.
+        - directory (str, optional): Directory of the disk cache, None for the one set with cache_courses_on_disk.
+
+    Returns:
+        - Course: The course.
+    """
+    if seed in _courses:
+        _courses.move_to_end(seed)
+        return _courses[seed]
+
+    directory = _directory if directory is None else directory
+    path = None if directory is None else os.path.join(directory, f'course-{seed}.bin')
+
+    course = None
+    if path is not None and os.path.exists(path):
+        try:
+            course = Course.load(path)
+        except ValueError:
+            course = None
+    if course is None:
+        course = Course(seed)
+        if path is not None:
+            course.save(path)
+
+    _courses[seed] = course
+    if len(_courses) > MEMORY_CAPACITY:
+        _courses.popitem(last=False)
+    return course
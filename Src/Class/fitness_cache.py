@@ -0,0 +1,77 @@
+from collections import OrderedDict
+
+# Variable
+from .network import genome_hash
+
+
+class FitnessCache:
+    """
+    A least-recently-used cache of episode fitness, keyed by genome_hash and course seed.
+
+    Only meaningful when courses are seeded: a genome that already played a course
+    keeps its fitness there instead of being simulated again.
+    """
+
+    def __init__(self, capacity=4096):
+        """
+        Initialize an empty cache.
+
+        Args:
+            - capacity (int, optional): Maximum number of cached fitness values (default is 4096).
+        """
+        self.capacity = capacity
+        self.fitness = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        """
+        Returns:
+            - int: Number of cached fitness values.
+        """
+        return len(self.fitness)
+
+    def __str__(self):
+        """
+        Returns:
+            - str: The size and hit/miss statistics of the cache.
+        """
+        lookups = self.hits + self.misses
+        rate = self.hits / lookups if lookups else 0.0
+        return f"{len(self)} entries, {self.hits} hits, {self.misses} misses ({rate:.1%} hit rate)"
+
+    def get(self, genome, course_seed):
+        """
+        Get the fitness of a genome on a course.
+
+        Args:
+            - genome (neat.DefaultGenome): The genome.
+            - course_seed (int): Seed of the pipe course.
+
+        Returns:
+            - float: The cached fitness, None on a miss.
+        """
+        key = (genome_hash(genome), course_seed)
+        fitness = self.fitness.get(key)
+        if fitness is None:
+            self.misses += 1
+            return None
+
+        self.fitness.move_to_end(key)
+        self.hits += 1
+        return fitness
+
+    def put(self, genome, course_seed, fitness):
+        """
+        Store the fitness of a genome on a course, evicting the least recently used entry if full.
+
+        Args:
+            - genome (neat.DefaultGenome): The genome.
+            - course_seed (int): Seed of the pipe course.
+            - fitness (float): The fitness of the episode.
+        """
+        key = (genome_hash(genome), course_seed)
+        self.fitness[key] = fitness
+        self.fitness.move_to_end(key)
+        if len(self.fitness) > self.capacity:
+            self.fitness.popitem(last=False)
@@ -0,0 +1,142 @@
+import numpy as np
+
+# Variable
+from .bird import bird_size, BIRD_IMAGES
+from .assets import get_image
+from .sensor import sensor_distances
+from .collision import collide
+from ..constant import WINDOW_HEIGHT, WINDOW_WIDTH, DT_SECONDS
+
+
+class Flock:
+    """
+    A struct-of-arrays population of birds, stepped together with NumPy.
+
+    Every array holds one entry per bird and follows the same rules as Player.
+    """
+
+    # Shared by every bird
+    size = bird_size
+    flap_interval = 0.5  # Interval threshold in seconds
+
+    def __init__(self, n_birds, start_y=0):
+        """
+        Initialize n_birds birds with the default attributes of Player.
+
+        Args:
+            - n_birds (int): Number of birds in the population.
+            - start_y (int, optional): Vertical offset of the starting position (default is 0).
+        """
+        self.x = np.full(n_birds, float((WINDOW_WIDTH - self.size[0]) // 2))
+        self.y = np.full(n_birds, float(WINDOW_HEIGHT // 4 + start_y))
+        self.velocity_y = np.full(n_birds, 5.0)
+        self.jump_strength = np.full(n_birds, -35.0)
+        self.gravity = np.full(n_birds, 22.0)
+        self.is_ground = np.zeros(n_birds, dtype=bool)
+        self.alive = np.ones(n_birds, dtype=bool)
+        self.image_index = np.zeros(n_birds, dtype=int)
+
+        self.time = 0.0  # Simulation time in seconds, advanced by update()
+        self.last_flap_time = np.full(n_birds, float('-inf'))
+
+    def __len__(self):
+        """
+        Returns:
+            - int: Number of birds, alive or dead.
+        """
+        return len(self.x)
+
+    def flap_up(self, mask):
+        """
+        Make the selected birds flap upward, chaining the jump like Player.flap_up.
+
+        Args:
+            - mask (np.ndarray): Boolean array selecting the birds that flap.
+        """
+        chained = self.time - self.last_flap_time[mask] < self.flap_interval
+        self.jump_strength[mask] = np.where(chained, self.jump_strength[mask] - 0.6, -30.0)
+        self.velocity_y[mask] = self.jump_strength[mask]
+        self.last_flap_time[mask] = self.time
+
+    def update(self, dt):
+        """
+        Update the position and state of every bird.
+
+        Args:
+            - dt (float): Time delta since the last update.
+        """
+        self.time += dt * DT_SECONDS
+        floor = WINDOW_HEIGHT - self.size[1]
+
+        # Birds on the ground bounce back with a flap and low gravity
+        airborne = (self.y < floor) | self.is_ground
+        relaunch = airborne & self.is_ground
+        if relaunch.any():
+            self.is_ground[relaunch] = False
+            self.flap_up(relaunch)
+            self.gravity[relaunch] = 2
+
+        # Check lower border and ground condition
+        self.y = np.where(airborne, self.y + self.velocity_y * dt, floor)
+        self.velocity_y = np.where(airborne, self.velocity_y + self.gravity * dt, 0.0)
+        self.gravity = np.where(airborne, self.gravity, 0.0)
+        self.is_ground = ~airborne
+
+        # Check upper border
+        above = self.y < 0
+        self.y[above] = 0
+        self.velocity_y[above] = 0
+
+    def rects(self):
+        """
+        Get the integer bounding boxes of the birds, truncated like pygame.Rect.
+
+        Returns:
+            - tuple of np.ndarray: Left and top coordinates of every bird.
+        """
+        return np.trunc(self.x), np.trunc(self.y)
+
+    def distances(self, tube):
+        """
+        Calculate the 8 sensor distances between every bird and a tube.
+
+        Args:
+            - tube (Tube): The tube the sensors point to.
+
+        Returns:
+            - np.ndarray: Distances of shape (n_birds, 8).
+        """
+        return sensor_distances(self.x, self.y, tube)
+
+    def collide_tubes(self, tube_list):
+        """
+        Check every living bird against both halves of every live tube at once.
+
+        Args:
+            - tube_list (TubeRing): The live tubes.
+
+        Returns:
+            - np.ndarray: Boolean array, True for the living birds that hit a tube.
+        """
+        return collide(self.x, self.y, self.size, tube_list) & self.alive
+
+    def draw(self, screen):
+        """
+        Draw the living birds onto the screen.
+
+        Args:
+            - screen (pygame.Surface): The surface to draw the birds on.
+
+        Returns:
+            - list[pygame.Rect]: The areas of the screen that were drawn.
+        """
+        left, top = self.rects()
+        images = [get_image(image) for image in BIRD_IMAGES]
+
+        drawn = [screen.blit(images[self.image_index[i]], (left[i], top[i])) for i in np.flatnonzero(self.alive)]
+
+        # Birds going up flap their wings
+        flapping = self.alive & (self.velocity_y < 0)
+        self.image_index[flapping] = (self.image_index[flapping] + 1) % len(BIRD_IMAGES)
+
+        return drawn
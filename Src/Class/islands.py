@@ -0,0 +1,370 @@
+import copy
+import json
+import queue
+import random
+import traceback
+from itertools import count
+from multiprocessing import Process, Queue
+
+import neat
+from neat.reporting import BaseReporter
+
+# Variable
+from .checkpoint import AsyncCheckpointer
+
+
+def parse_overrides(text):
+    """
+    Parse the config overrides of an island, written as 'key=value,key=value'.
+
+    Args:
+        - text (str): The overrides, empty for none.
+
+    Returns:
+        - dict: The values by key, still as strings.
+
+    Raises:
+        - ValueError: If an override has no '='.
+    """
+    overrides = {}
+    for item in filter(None, (item.strip() for item in text.split(','))):
+        if '=' not in item:
+            raise ValueError(f"Invalid island override {item!r}, use key=value")
+        key, value = item.split('=', 1)
+        overrides[key.strip()] = value.strip()
+    return overrides
+
+
+def apply_overrides(config, overrides):
+    """
+    Replace parameters of a loaded NEAT configuration, as if they were written in config.txt.
+
+    A key is looked up in the [NEAT] section first, then in the genome, reproduction,
+    species set and stagnation sections. Values are converted to the type of the current value.
+
+    Args:
+        - config (neat.Config): The configuration, changed in place.
+        - overrides (dict): The new values by parameter name, as strings.
+
+    Raises:
+        - KeyError: If a parameter does not exist in any section.
+    """
+    sections = (config, config.genome_config, config.reproduction_config,
+                config.species_set_config, config.stagnation_config)
+
+    for key, text in overrides.items():
+        section = next((section for section in sections if hasattr(section, key)), None)
+        if section is None:
+            raise KeyError(f"Unknown config parameter {key!r}")
+
+        current = getattr(section, key)
+        if isinstance(current, bool):
+            value = text.lower() in ('true', '1', 'yes')
+        elif isinstance(current, int):
+            value = int(float(text))
+        elif isinstance(current, float):
+            value = float(text)
+        elif isinstance(current, list):
+            value = text.split()
+        else:
+            value = text
+        setattr(section, key, value)
+
+
+def _reserve_node_keys(config, genomes):
+    """
+    Move the node indexer of the island past the node keys of incoming genomes,
+    so a mutation never gives a new node the key of an existing one.
+
+    Args:
+        - config (neat.Config): The configuration of the island.
+        - genomes (list): The genomes of the island, immigrants included.
+    """
+    highest = max(max(genome.nodes) for genome in genomes if genome.nodes)
+    genome_config = config.genome_config
+    next_key = highest + 1 if genome_config.node_indexer is None else next(genome_config.node_indexer)
+    genome_config.node_indexer = count(max(next_key, highest + 1))
+
+
+class MigrationReporter(BaseReporter):
+    """
+    Keeps copies of the best genomes of the last evaluated generation, the emigrants of the island.
+    """
+
+    def __init__(self, migrants):
+        """
+        Initialize the reporter.
+
+        Args:
+            - migrants (int): Number of genomes kept.
+        """
+        self.migrants = migrants
+        self.best = []
+        self.mean_fitness = 0.0
+        self.n_species = 0
+
+    def post_evaluate(self, config, population, species, best_genome):
+        """
+        Keep the best genomes of the generation and its statistics.
+
+        Args:
+            - config (neat.Config): The NEAT configuration.
+            - population (dict): The evaluated genomes, by key.
+            - species (neat.DefaultSpeciesSet): The species of the population.
+            - best_genome (neat.DefaultGenome): The best genome of the generation.
+        """
+        ranked = sorted(population.values(), key=lambda genome: genome.fitness, reverse=True)
+        self.best = [copy.deepcopy(genome) for genome in ranked[:self.migrants]]
+        self.mean_fitness = sum(genome.fitness for genome in ranked) / len(ranked)
+        self.n_species = len(species.species)
+
+
+def _island(index, model, overrides, generations, inbox, outbox):
+    """
+    Evolve one island in a worker process, exchanging genomes with the coordinator between epochs.
+
+    Every epoch runs migration_interval generations, sends the best genomes and the
+    statistics of the island to the coordinator and replaces new offspring with the
+    immigrants that arrived in the meantime. Migration never waits for another island.
+    The island stops at the generation limit, when it reaches the fitness threshold or
+    when the coordinator tells it that another island did.
+
+    Args:
+        - index (int): Index of the island.
+        - model (IslandModel): The settings of the model.
+        - overrides (dict): Config parameters of this island, see apply_overrides.
+        - generations (int): Maximum number of generations.
+        - inbox (multiprocessing.Queue): Immigrants and the stop message sent by the coordinator.
+        - outbox (multiprocessing.Queue): Messages to the coordinator.
+    """
+    try:
+        # Processes started with spawn or forkserver do not inherit the settings of the fitness function
+        if model.initializer is not None:
+            model.initializer(*model.initargs)
+
+        if model.checkpoint is not None:
+            generation, config, population, species_set, rndstate = AsyncCheckpointer.load_checkpoint(model.checkpoint)
+            apply_overrides(config, overrides)
+            p = neat.Population(config, (population, species_set, generation))
+        else:
+            config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                                 neat.DefaultSpeciesSet, neat.DefaultStagnation, model.config_file)
+            apply_overrides(config, overrides)
+            p = neat.Population(config)
+
+        # Forked islands share the random state of the parent, every island needs its own
+        random.seed(None if model.seed is None else model.seed + index)
+
+        migration = MigrationReporter(model.migrants)
+        p.add_reporter(migration)
+        checkpointer = AsyncCheckpointer(generation_interval=model.migration_interval,
+                                         filename_prefix=f'{model.checkpoint_prefix}{index}-', keep=model.keep)
+        p.add_reporter(checkpointer)
+
+        stopped = False
+        while p.generation < generations and not stopped:
+            p.run(model.fitness_function, min(model.migration_interval, generations - p.generation))
+
+            solved = not config.no_fitness_termination and p.best_genome.fitness >= config.fitness_threshold
+            outbox.put(('epoch', index, {
+                'generation': p.generation,
+                'best_fitness': migration.best[0].fitness,
+                'mean_fitness': migration.mean_fitness,
+                'species': migration.n_species,
+                'solved': solved,
+            }, (migration.best, copy.deepcopy(p.best_genome))))
+            if solved:
+                break
+
+            # Gli immigrati prendono il posto dei nuovi figli, che non sono ancora stati valutati
+            immigrants = []
+            while True:
+                try:
+                    kind, genomes = inbox.get_nowait()
+                except queue.Empty:
+                    break
+                if kind == 'stop':
+                    stopped = True
+                else:
+                    immigrants.extend(genomes)
+            if stopped:
+                break
+
+            offspring = [key for key, genome in p.population.items() if genome.fitness is None]
+            for key, immigrant in zip(offspring, immigrants):
+                del p.population[key]
+                immigrant.key = next(p.reproduction.genome_indexer)
+                immigrant.fitness = None
+                p.population[immigrant.key] = immigrant
+                p.reproduction.ancestors[immigrant.key] = ()
+
+            if immigrants:
+                _reserve_node_keys(config, list(p.population.values()))
+                p.species.speciate(config, p.population, p.generation)
+
+        checkpointer.close()
+        outbox.put(('done', index, (config, p.population, p.species, p.generation), p.best_genome))
+
+    except Exception:
+        outbox.put(('failed', index, traceback.format_exc(), None))
+
+
+class IslandModel:
+    """
+    Evolves several NEAT populations in parallel processes, with migration of the best genomes.
+
+    Every island is a worker process with its own population and config overrides. Islands
+    form a ring: every migration_interval generations an island sends its best genomes to the
+    coordinator, which forwards them to the next island. The coordinator merges the
+    statistics of the islands, keeps the best genome overall and writes the final
+    population of the island that found it as a regular checkpoint.
+
+    Islands talk to the coordinator only through two kinds of queue, one outbox shared by
+    every island and one inbox per island. As soon as one island reaches the fitness
+    threshold, the coordinator tells every other island to stop after its current epoch.
+    """
+
+    def __init__(self, config_file, overrides, fitness_function, migration_interval=10, migrants=2,
+                 checkpoint_prefix='neat-checkpoint-island', seed=None, stats_file=None, checkpoint=None,
+                 keep=3, initializer=None, initargs=()):
+        """
+        Initialize the model, call run() to start the islands.
+
+        Args:
+            - config_file (str): Path to the NEAT configuration file.
+            - overrides (list[dict]): Config overrides of every island, one dict per island.
+            - fitness_function (callable): Function taking (genomes, config) and assigning their fitness.
+            - migration_interval (int, optional): Generations between migrations (default is 10).
+            - migrants (int, optional): Number of genomes an island sends every migration (default is 2).
+            - checkpoint_prefix (str, optional): Prefix of the checkpoint files, followed by the island index.
+            - seed (int, optional): Base seed of the random state of the islands, None for random ones.
+            - stats_file (str, optional): JSON-lines file for the statistics of every epoch (default is None).
+            - checkpoint (str, optional): Checkpoint every island starts from, None to start from scratch.
+            - keep (int, optional): Number of checkpoints every island keeps on disk (default is 3).
+            - initializer (callable, optional): Called with initargs in every island when it starts, to set the
+              settings of the fitness function, which islands started with spawn do not inherit (default is None).
+            - initargs (tuple, optional): Arguments of the initializer (default is ()).
+        """
+        self.config_file = config_file
+        self.overrides = overrides
+        self.fitness_function = fitness_function
+        self.migration_interval = migration_interval
+        self.migrants = migrants
+        self.checkpoint_prefix = checkpoint_prefix
+        self.seed = seed
+        self.stats_file = stats_file
+        self.checkpoint = checkpoint
+        self.keep = keep
+        self.initializer = initializer
+        self.initargs = initargs
+
+        self.best_genome = None
+        self.best_island = None
+        self.stats = {}  # Last statistics of every island
+        self.states = {}  # Final (config, population, species_set, generation) of every island
+
+    def run(self, generations):
+        """
+        Evolve every island until it reaches the generation limit or the fitness threshold.
+
+        Args:
+            - generations (int): Maximum number of generations of every island.
+
+        Returns:
+            - neat.DefaultGenome: The best genome found by any island.
+
+        Raises:
+            - RuntimeError: If an island fails.
+        """
+        n_islands = len(self.overrides)
+        inboxes = [Queue() for _ in range(n_islands)]
+        outbox = Queue()
+        islands = [Process(target=_island, daemon=True,
+                           args=(i, self, self.overrides[i], generations, inboxes[i], outbox))
+                   for i in range(n_islands)]
+        for island in islands:
+            island.start()
+
+        stats_file = open(self.stats_file, 'a') if self.stats_file is not None else None
+        running = set(range(n_islands))
+        stopping = set()  # Islands that solved or were told to stop, they take no more immigrants
+        errors = []
+        try:
+            while running:
+                try:
+                    kind, index, payload, genomes = outbox.get(timeout=1.0)
+                except queue.Empty:
+                    # An island killed from outside never says goodbye
+                    for i in list(running):
+                        if not islands[i].is_alive():
+                            running.discard(i)
+                            errors.append(f'Island {i} exited with code {islands[i].exitcode}')
+                    continue
+
+                if kind == 'epoch':
+                    emigrants, best = genomes
+                    self._record(index, payload, best, stats_file)
+                    if payload['solved']:
+                        for i in running - stopping:
+                            inboxes[i].put(('stop', None))
+                        stopping |= running
+                    target = (index + 1) % n_islands
+                    if target != index and target not in stopping:
+                        inboxes[target].put(('migrants', emigrants))
+                elif kind == 'done':
+                    self.states[index] = payload
+                    running.discard(index)
+                    stopping.add(index)
+                else:
+                    errors.append(f'Island {index} failed:\n{payload}')
+                    running.discard(index)
+                    stopping.add(index)
+        finally:
+            if stats_file is not None:
+                stats_file.close()
+
+            # Messages nobody will read would keep this process waiting at exit
+            for inbox in inboxes:
+                inbox.cancel_join_thread()
+            for island in islands:
+                island.join(timeout=5.0)
+
+        if errors:
+            raise RuntimeError('\n'.join(errors))
+        return self.best_genome
+
+    def _record(self, index, stats, best, stats_file):
+        """
+        Merge the statistics of one epoch of an island and print them.
+
+        Args:
+            - index (int): Index of the island.
+            - stats (dict): Generation, best and mean fitness, number of species and whether it is solved.
+            - best (neat.DefaultGenome): The best genome found so far by the island.
+            - stats_file (file): Open JSON-lines file, None to only print.
+        """
+        self.stats[index] = stats
+        if self.best_genome is None or best.fitness > self.best_genome.fitness:
+            self.best_genome = best
+            self.best_island = index
+
+        print(f"Island {index} generation {stats['generation']}: best {stats['best_fitness']:.2f}, "
+              f"mean {stats['mean_fitness']:.2f}, {stats['species']} species | "
+              f"overall best {self.best_genome.fitness:.2f} (island {self.best_island})")
+
+        if stats_file is not None:
+            stats_file.write(json.dumps({'island': index, **stats}) + '\n')
+            stats_file.flush()
+
+    def save_checkpoint(self, checkpointer, filename=None):
+        """
+        Write the final population of the island that found the best genome as a regular checkpoint,
+        so a single-population run can resume from it.
+
+        Args:
+            - checkpointer (AsyncCheckpointer): The checkpointer that writes the file.
+            - filename (str, optional): Destination file, None for the prefix of the checkpointer followed by the generation.
+        """
+        if self.best_island in self.states:
+            config, population, species_set, generation = self.states[self.best_island]
+            checkpointer.save_checkpoint(config, population, species_set, generation, filename)
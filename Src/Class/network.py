@@ -0,0 +1,241 @@
+import os
+import json
+from collections import OrderedDict
+
+import neat
+import numpy as np
+from neat.activations import tanh_activation
+from neat.aggregations import sum_aggregation
+
+# Variable
+from .champion import CHAMPION_FORMAT, CHAMPION_VERSION, ACTIVATIONS, AGGREGATIONS
+
+
+class BatchNetwork:
+    """
+    The feed-forward networks of a whole population, evaluated together with NumPy.
+
+    Every network is flattened into padded matrices: at step s each genome computes
+    one node, tanh(bias + response * sum(weights * values)), in the same order as
+    neat.nn.FeedForwardNetwork.activate. Only tanh activation and sum aggregation
+    are supported, as set in config.txt.
+    """
+
+    def __init__(self, nets):
+        """
+        Compile a list of feed-forward networks into padded matrices.
+
+        Args:
+            - nets (list[neat.nn.FeedForwardNetwork]): The networks of the population.
+
+        Raises:
+            - ValueError: If a node uses an activation other than tanh or an aggregation other than sum.
+        """
+        self.n_inputs = len(nets[0].input_nodes)
+        self.n_outputs = len(nets[0].output_nodes)
+
+        # Column of every node in the value matrix, inputs first
+        columns = []
+        for net in nets:
+            column = {key: i for i, key in enumerate(net.input_nodes)}
+            for node, *_ in net.node_evals:
+                column[node] = len(column)
+            for node in net.output_nodes:
+                column.setdefault(node, len(column))
+            columns.append(column)
+
+        n_steps = max(len(net.node_evals) for net in nets)
+        n_columns = max(len(column) for column in columns)
+        self.scratch = n_columns  # Padding steps write into this column
+
+        self.target = np.full((len(nets), n_steps), self.scratch)
+        self.weight = np.zeros((len(nets), n_steps, n_columns + 1))
+        self.bias = np.zeros((len(nets), n_steps))
+        self.response = np.zeros((len(nets), n_steps))
+        self.output = np.zeros((len(nets), self.n_outputs), dtype=int)
+
+        for g, (net, column) in enumerate(zip(nets, columns)):
+            for s, (node, act_func, agg_func, bias, response, links) in enumerate(net.node_evals):
+                if act_func is not tanh_activation or agg_func is not sum_aggregation:
+                    raise ValueError(f"Node {node} is not a tanh/sum node")
+
+                self.target[g, s] = column[node]
+                self.bias[g, s] = bias
+                self.response[g, s] = response
+                for i, w in links:
+                    self.weight[g, s, column[i]] += w
+
+            self.output[g] = [column[node] for node in net.output_nodes]
+
+    @classmethod
+    def create(cls, genomes, config, cache=None):
+        """
+        Build the batch network of a list of genomes.
+
+        Args:
+            - genomes (list[neat.DefaultGenome]): The genomes of the population.
+            - config (neat.Config): The NEAT configuration.
+            - cache (NetworkCache, optional): Cache of already created networks (default is None).
+
+        Returns:
+            - BatchNetwork: The compiled population.
+        """
+        if cache is None:
+            return cls([neat.nn.FeedForwardNetwork.create(genome, config) for genome in genomes])
+        return cls([cache.get(genome, config) for genome in genomes])
+
+    def activate(self, inputs, rows=None):
+        """
+        Evaluate the networks on a batch of inputs.
+
+        Args:
+            - inputs (np.ndarray): Inputs of shape (n, n_inputs), one row per network.
+            - rows (np.ndarray, optional): Indices of the networks to evaluate, None for all of them.
+
+        Returns:
+            - np.ndarray: Outputs of shape (n, n_outputs).
+        """
+        if rows is None:
+            rows = slice(None)
+
+        target, weight = self.target[rows], self.weight[rows]
+        bias, response = self.bias[rows], self.response[rows]
+        index = np.arange(len(target))
+
+        values = np.zeros((len(target), self.scratch + 1))
+        values[:, :self.n_inputs] = inputs
+
+        for s in range(target.shape[1]):
+            z = bias[:, s] + response[:, s] * np.einsum('ij,ij->i', weight[:, s], values)
+            values[index, target[:, s]] = np.tanh(np.clip(2.5 * z, -60.0, 60.0))
+
+        return values[index[:, None], self.output[rows]]
+
+
+def export_champion(genome, config, path):
+    """
+    Save a trained genome as a standalone network that Champion runs without neat-python.
+
+    The network is built like neat.nn.FeedForwardNetwork, which keeps only the enabled
+    connections and the nodes that are reachable from the inputs and needed by an output,
+    in topological order. Every node is flattened into its bias, response, functions and
+    the slots and weights of its inputs: slots 0 to n_inputs - 1 are the inputs, then one
+    slot per node in evaluation order. Outputs that cannot be reached from the inputs are
+    always 0, as in neat-python.
+
+    Args:
+        - genome (neat.DefaultGenome): The genome to export.
+        - config (neat.Config): The NEAT configuration.
+        - path (str): Destination JSON file.
+
+    Returns:
+        - dict: The flattened network.
+
+    Raises:
+        - ValueError: If a node uses an activation or aggregation that Champion does not support.
+    """
+    net = neat.nn.FeedForwardNetwork.create(genome, config)
+    slot = {key: i for i, key in enumerate(net.input_nodes)}
+
+    nodes = []
+    for node, act_func, agg_func, bias, response, links in net.node_evals:
+        gene = genome.nodes[node]
+        if gene.activation not in ACTIVATIONS or gene.aggregation not in AGGREGATIONS:
+            raise ValueError(f"Node {node} uses {gene.activation}/{gene.aggregation}, which cannot be exported")
+
+        nodes.append({
+            'key': node,
+            'activation': gene.activation,
+            'aggregation': gene.aggregation,
+            'bias': bias,
+            'response': response,
+            'sources': [slot[i] for i, w in links],
+            'weights': [w for i, w in links],
+        })
+        slot[node] = len(slot)
+
+    champion = {
+        'format': CHAMPION_FORMAT,
+        'version': CHAMPION_VERSION,
+        'fitness': genome.fitness,
+        'inputs': len(net.input_nodes),
+        'outputs': [slot.get(node) for node in net.output_nodes],
+        'nodes': nodes,
+    }
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(champion, f, indent=1)
+    return champion
+
+
+def genome_hash(genome):
+    """
+    Hash the structure and weights of a genome, ignoring its key and fitness.
+
+    Args:
+        - genome (neat.DefaultGenome): The genome.
+
+    Returns:
+        - int: The hash, equal for genomes that build the same network.
+    """
+    nodes = tuple(sorted((key, node.bias, node.response, node.activation, node.aggregation)
+                         for key, node in genome.nodes.items()))
+    connections = tuple(sorted((key, connection.weight, connection.enabled)
+                               for key, connection in genome.connections.items()))
+    return hash((nodes, connections))
+
+
+class NetworkCache:
+    """
+    A least-recently-used cache of feed-forward networks, keyed by genome_hash.
+
+    Elites and unchanged offspring build the same network every generation, so they
+    are created only once while they stay among the `capacity` most recently used.
+    """
+
+    def __init__(self, capacity=1024):
+        """
+        Initialize an empty cache.
+
+        Args:
+            - capacity (int, optional): Maximum number of cached networks (default is 1024).
+        """
+        self.capacity = capacity
+        self.networks = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        """
+        Returns:
+            - int: Number of cached networks.
+        """
+        return len(self.networks)
+
+    def get(self, genome, config):
+        """
+        Get the network of a genome, creating and caching it on a miss.
+
+        Args:
+            - genome (neat.DefaultGenome): The genome.
+            - config (neat.Config): The NEAT configuration.
+
+        Returns:
+            - neat.nn.FeedForwardNetwork: The network.
+        """
+        key = genome_hash(genome)
+        net = self.networks.get(key)
+        if net is not None:
+            self.networks.move_to_end(key)
+            self.hits += 1
+            return net
+
+        self.misses += 1
+        net = neat.nn.FeedForwardNetwork.create(genome, config)
+        self.networks[key] = net
+        if len(self.networks) > self.capacity:
+            self.networks.popitem(last=False)
+        return net
@@ -0,0 +1,126 @@
+import random
+from multiprocessing import Pool
+
+import numpy as np
+
+# Variable
+from .aggregate import FitnessAggregator
+
+
+def _play(job):
+    """
+    Play the episode of one batch in a worker process.
+
+    Args:
+        - job (tuple): Indices of the genomes, episode function, genomes, config and course seed.
+
+    Returns:
+        - tuple: The indices of the genomes, the course seed and their fitness.
+    """
+    batch, episode_function, genomes, config, course_seed = job
+    return batch, course_seed, episode_function(genomes, config, course_seed)
+
+
+class FlockEvaluator:
+    """
+    Evaluates a population in parallel worker processes, one headless episode per batch of genomes.
+
+    Every batch plays the same pipe course. With a shared-world episode function such as
+    simulate, the birds of a batch share one world whose difficulty rises with the best
+    bird, so a genome's fitness still depends on the other genomes of its batch, and
+    therefore on how the population is split. With a per-bird episode function such as
+    simulate_worlds, every genome plays alone and its fitness does not depend on the split.
+    With courses, every batch plays each of the fixed courses and the episodes are combined
+    by a FitnessAggregator as they finish, in whatever order the workers complete them.
+    Plugs into neat.Population.run like neat.ParallelEvaluator.
+    """
+
+    def __init__(self, num_workers, episode_function, seed=None, courses=0, reducer='mean', cache=None,
+                 initializer=None, initargs=()):
+        """
+        Start the worker pool.
+
+        Args:
+            - num_workers (int): Number of worker processes, and of batches the population is split into.
+            - episode_function (callable): Function taking (genomes, config, course_seed) and returning their fitness.
+            - seed (int, optional): Base seed of the pipe courses, None for a random course every generation.
+            - courses (int, optional): Play this many fixed courses every generation, 0 for one new course (default is 0).
+            - reducer (str, optional): How the fitness of the courses is combined (default is 'mean').
+            - cache (FitnessCache, optional): Fitness of genomes on seeded courses, looked up before the
+              episodes are sent to the workers, only valid with a per-bird episode function (default is None).
+            - initializer (callable, optional): Called with initargs in every worker when it starts, to set the
+              settings of the episode function, which workers started with spawn do not inherit (default is None).
+            - initargs (tuple, optional): Arguments of the initializer (default is ()).
+        """
+        self.num_workers = num_workers
+        self.episode_function = episode_function
+        self.seed = seed
+        self.courses = courses
+        self.reducer = reducer
+        self.cache = cache
+        self.generation = 0
+        self.pool = Pool(processes=num_workers, initializer=initializer, initargs=initargs)
+
+    def __del__(self):
+        """
+        Stop the worker processes when the evaluator is garbage collected.
+        """
+        self.close()
+
+    def close(self):
+        """
+        Stop the worker processes.
+        """
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+    def evaluate(self, genomes, config):
+        """
+        Evaluate the genomes of one generation and assign their fitness.
+
+        Args:
+            - genomes (list[tuple]): The (genome_id, genome) pairs of the population.
+            - config (neat.Config): The NEAT configuration.
+        """
+        self.generation += 1
+        if self.courses > 0:
+            base_seed = 0 if self.seed is None else self.seed
+            course_seeds = [base_seed + k for k in range(self.courses)]
+        elif self.seed is None:
+            course_seeds = [random.randrange(2 ** 32)]
+        else:
+            course_seeds = [self.seed + self.generation]
+
+        ge = [genome for genome_id, genome in genomes]
+        seeded = self.courses > 0 or self.seed is not None
+        aggregator = FitnessAggregator(len(ge), self.reducer)
+
+        # Only the genomes missing from the cache are played, split among the workers
+        jobs = []
+        for course_seed in course_seeds:
+            rows = np.arange(len(ge))
+            if self.cache is not None and seeded:
+                cached = np.array([np.nan if value is None else value
+                                   for value in (self.cache.get(genome, course_seed) for genome in ge)])
+                hit = ~np.isnan(cached)
+                if hit.any():
+                    aggregator.add(cached[hit], np.flatnonzero(hit))
+                rows = np.flatnonzero(~hit)
+
+            for batch in np.array_split(rows, self.num_workers):
+                if len(batch) > 0:
+                    jobs.append((batch, self.episode_function, [ge[i] for i in batch], config, course_seed))
+
+        for batch, course_seed, fitness in self.pool.imap_unordered(_play, jobs):
+            aggregator.add(fitness, batch)
+            if self.cache is not None and seeded:
+                for i, value in zip(batch, fitness):
+                    self.cache.put(ge[i], course_seed, value)
+
+        for genome, fitness in zip(ge, aggregator.result()):
+            genome.fitness = float(fitness)
+
+        if self.cache is not None:
+            print(f"Fitness cache: {self.cache}")
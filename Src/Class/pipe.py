@@ -3,27 +3,43 @@ import pygame
 import random
 
 # Variable
+from .assets import get_image, image_size
 from ..constant import WINDOW_HEIGHT, WINDOW_WIDTH
-tube_image = pygame.image.load(os.path.join('.', 'Src', 'flappy', 'pipe', 'pipe.png'))
-tube_image_reverse = pygame.image.load(os.path.join('.', 'Src', 'flappy', 'pipe', 'pipe2.png'))
-pipe_width, pipe_height = tube_image.get_size()
+TUBE_IMAGE = os.path.join('.', 'Src', 'flappy', 'pipe', 'pipe.png')
+TUBE_IMAGE_REVERSE = os.path.join('.', 'Src', 'flappy', 'pipe', 'pipe2.png')
+pipe_width, pipe_height = image_size(TUBE_IMAGE)
 
 class Tube:
     """
     Represents a tube object in the Flappy Bird game.
     """
+    __slots__ = ('x_velocity', 'delta', 'h_tube', 'h_tube_rotate', 'position', 'position_rotate',
+                 'velocity_y', 'rect', 'rect_reverse')
+
     size = [pipe_width, pipe_height]
 
-    def __init__(self, v_delta, x_velocity=0):
+    def __init__(self, v_delta, x_velocity=0, delta=None):
         """
         Initializes a new Tube object with a random vertical position.
 
         Args:
             - v_delta (int): Initial vertical position of the tube.
             - x_velocity (int, optional): Horizontal velocity of the tube (default is 0).
+            - delta (int, optional): Vertical variation, usually taken from a Course (default is random).
+        """
+        self.reset(v_delta, x_velocity, delta)
+
+    def reset(self, v_delta, x_velocity=0, delta=None):
+        """
+        Moves the tube back to the right border with a new vertical position, so it can be reused.
+
+        Args:
+            - v_delta (int): Initial vertical position of the tube.
+            - x_velocity (int, optional): Horizontal velocity of the tube (default is 0).
+            - delta (int, optional): Vertical variation, usually taken from a Course (default is random).
         """
         self.x_velocity = x_velocity
-        self.delta = random.randint(-180, 180)  # Random vertical variation
+        self.delta = random.randint(-180, 180) if delta is None else delta  # Vertical variation
 
         # Calculate heights of the tube and its reversed counterpart
         self.h_tube = v_delta + self.delta
@@ -36,23 +52,31 @@ class Tube:
         # Set vertical velocity based on horizontal velocity
         self.velocity_y = 15 + self.x_velocity
 
+        # Rects are allocated once and moved in place by get_rect() and get_rect_reverse()
+        self.rect = pygame.Rect(self.position, self.size)
+        self.rect_reverse = pygame.Rect(self.position_rotate, self.size)
+
     def get_rect(self):
         """
         Returns a pygame.Rect object for the normal tube.
 
         Returns:
-        - pygame.Rect: Rect object representing the bounding box of the normal tube.
+        - pygame.Rect: Rect object representing the bounding box of the normal tube, updated in place.
         """
-        return pygame.Rect(self.position, (pipe_width, pipe_height))
+        self.rect.x = int(self.position[0])
+        self.rect.y = int(self.position[1])
+        return self.rect
 
     def get_rect_reverse(self):
         """
         Returns a pygame.Rect object for the reversed tube.
 
         Returns:
-            - pygame.Rect: Rect object representing the bounding box of the reversed tube.
+            - pygame.Rect: Rect object representing the bounding box of the reversed tube, updated in place.
         """
-        return pygame.Rect(self.position_rotate, (pipe_width, pipe_height))
+        self.rect_reverse.x = int(self.position_rotate[0])
+        self.rect_reverse.y = int(self.position_rotate[1])
+        return self.rect_reverse
 
     def draw(self, screen):
         """
@@ -60,9 +84,13 @@ class Tube:
 
         Args:
             - screen (pygame.Surface): Surface onto which to draw.
+
+        Returns:
+            - list[pygame.Rect]: The areas of the screen that were drawn.
         """
-        screen.blit(tube_image, self.position)  # Draw normal tube
-        screen.blit(tube_image_reverse, self.position_rotate)  # Draw reversed tube
+        drawn = screen.blit(get_image(TUBE_IMAGE), self.position)  # Draw normal tube
+        drawn_reverse = screen.blit(get_image(TUBE_IMAGE_REVERSE), self.position_rotate)  # Draw reversed tube
+        return [drawn, drawn_reverse]
 
     def update(self, dt):
         """
@@ -0,0 +1,155 @@
+import os
+import csv
+import json
+import time
+
+import numpy as np
+from neat.reporting import BaseReporter
+
+
+class StageTimer:
+    """
+    Accumulates the time spent in each stage of a frame loop and the latency of every frame.
+
+    Call start_frame() at the top of the loop, mark(stage) after each stage and
+    end_frame() at the bottom. A disabled timer does nothing.
+    """
+
+    def __init__(self, enabled=True):
+        """
+        Initialize an empty timer.
+
+        Args:
+            - enabled (bool, optional): Whether the timer records anything (default is True).
+        """
+        self.enabled = enabled
+        self.reset()
+
+    def reset(self):
+        """
+        Forget every recorded frame.
+        """
+        self.stages = {}
+        self.frame_times = []
+        self.bird_frames = 0
+        self._frame_start = self._last = 0.0
+
+    def start_frame(self):
+        """
+        Start timing a frame.
+        """
+        if self.enabled:
+            self._frame_start = self._last = time.perf_counter()
+
+    def mark(self, stage):
+        """
+        Charge the time since the previous mark to a stage.
+
+        Args:
+            - stage (str): Name of the stage that just finished.
+        """
+        if self.enabled:
+            now = time.perf_counter()
+            self.stages[stage] = self.stages.get(stage, 0.0) + now - self._last
+            self._last = now
+
+    def end_frame(self, n_birds=1):
+        """
+        Finish timing a frame.
+
+        Args:
+            - n_birds (int, optional): Number of birds simulated in the frame (default is 1).
+        """
+        if self.enabled:
+            self.frame_times.append(time.perf_counter() - self._frame_start)
+            self.bird_frames += n_birds
+
+    def summary(self):
+        """
+        Summarize the recorded frames.
+
+        Returns:
+            - dict: Number of frames, birds simulated, p50/p99 frame latency (None without frames)
+              and total seconds of every stage.
+        """
+        p50_ms = p99_ms = None
+        if self.frame_times:
+            frame_times = np.array(self.frame_times)
+            p50_ms = 1000 * float(np.percentile(frame_times, 50))
+            p99_ms = 1000 * float(np.percentile(frame_times, 99))
+        return {
+            'frames': len(self.frame_times),
+            'bird_frames': self.bird_frames,
+            'p50_ms': p50_ms,
+            'p99_ms': p99_ms,
+            'stages': dict(self.stages),
+        }
+
+
+class TelemetryReporter(BaseReporter):
+    """
+    A NEAT reporter that appends one telemetry record per generation to a CSV or JSON-lines file.
+
+    Every record holds the generation wall time, the frames simulated, the birds simulated
+    per second, the p50/p99 frame latency and the seconds spent in every stage of the timer.
+    """
+
+    def __init__(self, timer, filename):
+        """
+        Initialize the reporter. Records are appended, so a resumed run continues the same file.
+
+        Args:
+            - timer (StageTimer): The timer of the frame loop, reset at the start of every generation.
+            - filename (str): Output file, written as CSV if it ends in .csv and as JSON lines otherwise.
+        """
+        self.timer = timer
+        self.filename = filename
+        self.as_csv = filename.endswith('.csv')
+        self.generation = None
+        self.generation_start = 0.0
+        self.header = None
+
+        # A CSV file from an earlier run keeps its columns
+        if self.as_csv and os.path.exists(filename):
+            with open(filename, newline='') as f:
+                self.header = next(csv.reader(f), None)
+
+    def start_generation(self, generation):
+        """
+        Start timing a generation.
+
+        Args:
+            - generation (int): Index of the generation.
+        """
+        self.generation = generation
+        self.generation_start = time.perf_counter()
+        self.timer.reset()
+
+    def end_generation(self, config, population, species_set):
+        """
+        Write the record of the generation that just ended.
+        """
+        wall_time = time.perf_counter() - self.generation_start
+        summary = self.timer.summary()
+
+        record = {
+            'generation': self.generation,
+            'wall_time': wall_time,
+            'frames': summary['frames'],
+            'birds_per_sec': summary['bird_frames'] / wall_time,
+            'p50_ms': summary['p50_ms'],
+            'p99_ms': summary['p99_ms'],
+        }
+        for stage, seconds in summary['stages'].items():
+            record[f'{stage}_s'] = seconds
+
+        with open(self.filename, 'a', newline='') as f:
+            if not self.as_csv:
+                f.write(json.dumps(record) + '\n')
+                return
+
+            # The columns are fixed by the first generation
+            if self.header is None:
+                self.header = list(record)
+                csv.writer(f).writerow(self.header)
+            csv.writer(f).writerow([record.get(column, 0.0) for column in self.header])
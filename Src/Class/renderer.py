@@ -0,0 +1,77 @@
+import pygame
+
+
+class DirtyRenderer:
+    """
+    Redraws only the parts of the window that changed since the last frame.
+
+    The background is composited once. Every frame, begin_frame() restores it under
+    whatever was drawn in the previous frame, the caller draws and passes the rects
+    returned by its blits to add(), and end_frame() pushes the erased and drawn rects
+    to the display with pygame.display.update(rects) instead of flipping the whole window.
+    """
+
+    def __init__(self, screen, background_image, max_rects=64):
+        """
+        Composite the background and schedule a full redraw.
+
+        Args:
+            - screen (pygame.Surface): The display surface.
+            - background_image (pygame.Surface): Background tile, repeated horizontally across the window.
+            - max_rects (int, optional): Above this many dirty rects the whole window is updated (default is 64).
+        """
+        self.screen = screen
+        self.max_rects = max_rects
+
+        self.background = pygame.Surface(screen.get_size()).convert()
+        for x in range(0, screen.get_width(), background_image.get_width()):
+            self.background.blit(background_image, (x, 0))
+
+        self.previous = []  # Rects drawn in the last frame
+        self.erased = []
+        self.drawn = []
+        self.full = True
+
+    def invalidate(self):
+        """
+        Redraw and update the whole window in the next frame.
+        """
+        self.full = True
+
+    def begin_frame(self):
+        """
+        Restore the background under everything drawn in the last frame.
+        """
+        if self.full:
+            self.screen.blit(self.background, (0, 0))
+        else:
+            for rect in self.previous:
+                self.screen.blit(self.background, rect, rect)
+
+        self.erased = self.previous
+        self.drawn = []
+
+    def add(self, rects):
+        """
+        Mark the area of a drawing as dirty.
+
+        Args:
+            - rects (pygame.Rect or list[pygame.Rect]): The rects returned by blit or pygame.draw.
+        """
+        if isinstance(rects, pygame.Rect):
+            self.drawn.append(rects)
+        else:
+            self.drawn.extend(rects)
+
+    def end_frame(self):
+        """
+        Push the dirty areas of the frame to the display.
+        """
+        dirty = self.erased + self.drawn
+        if self.full or len(dirty) > self.max_rects:
+            pygame.display.update()
+        else:
+            pygame.display.update(dirty)
+
+        self.previous = self.drawn
+        self.full = False
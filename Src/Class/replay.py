@@ -0,0 +1,208 @@
+import os
+import struct
+
+import numpy as np
+
+# Variable
+from .assets import get_image
+from .bird import BIRD_IMAGES
+from .pipe import TUBE_IMAGE, TUBE_IMAGE_REVERSE
+
+REPLAY_MAGIC = b'FBR1'
+REPLAY_HEADER = struct.Struct('<4sIIq')  # magic, number of birds, pipe slots, course seed (-1 if random)
+
+
+def frame_dtype(n_birds, n_pipes):
+    """
+    Get the fixed-width record of one frame.
+
+    Args:
+        - n_birds (int): Number of birds of the episode.
+        - n_pipes (int): Number of pipe slots, unused slots have a NaN position.
+
+    Returns:
+        - np.dtype: The structured record, little-endian and unpadded.
+    """
+    n_bytes = (n_birds + 7) // 8
+    return np.dtype([
+        ('frame', '<u4'),
+        ('score', '<u4'),
+        ('pipe_x', '<f4', (n_pipes,)),
+        ('pipe_y', '<f4', (n_pipes,)),
+        ('pipe_y_rotate', '<f4', (n_pipes,)),
+        ('bird_x', '<f4', (n_birds,)),
+        ('bird_y', '<f4', (n_birds,)),
+        ('velocity_y', '<f4', (n_birds,)),
+        ('alive', 'u1', (n_bytes,)),  # Bit-packed, one bit per bird
+        ('flap', 'u1', (n_bytes,)),
+    ])
+
+
+class ReplayRecorder:
+    """
+    Appends the state of every frame of an episode to a replay file.
+
+    The file is a small header followed by one fixed-width record per frame, so it
+    can be memory-mapped and read while it is still being written.
+    """
+
+    def __init__(self, path, n_birds, course_seed=None, n_pipes=8):
+        """
+        Create the replay file and write its header.
+
+        Args:
+            - path (str): Destination file.
+            - n_birds (int): Number of birds of the episode.
+            - course_seed (int, optional): Seed of the pipe course, None if random.
+            - n_pipes (int, optional): Number of pipe slots, the capacity of the TubeRing (default is 8).
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.n_birds = n_birds
+        self.n_pipes = n_pipes
+        self.record = np.zeros(1, dtype=frame_dtype(n_birds, n_pipes))
+        self.frame = 0
+
+        self.file = open(path, 'wb')
+        self.file.write(REPLAY_HEADER.pack(REPLAY_MAGIC, n_birds, n_pipes, -1 if course_seed is None else course_seed))
+
+    def write(self, x, y, velocity_y, alive, flaps, tube_list, score):
+        """
+        Append the state of one frame.
+
+        Args:
+            - x (np.ndarray): Horizontal position of every bird.
+            - y (np.ndarray): Vertical position of every bird.
+            - velocity_y (np.ndarray): Vertical velocity of every bird.
+            - alive (np.ndarray): Boolean array of the living birds.
+            - flaps (np.ndarray): Boolean array of the birds that flapped this frame.
+            - tube_list (TubeRing): The live tubes.
+            - score (int): Pipes passed so far.
+        """
+        record = self.record[0]
+        record['frame'] = self.frame
+        record['score'] = score
+
+        record['pipe_x'] = record['pipe_y'] = record['pipe_y_rotate'] = np.nan
+        for slot, tube in enumerate(tube_list):
+            if slot == self.n_pipes:
+                break
+            record['pipe_x'][slot] = tube.position[0]
+            record['pipe_y'][slot] = tube.position[1]
+            record['pipe_y_rotate'][slot] = tube.position_rotate[1]
+
+        record['bird_x'] = x
+        record['bird_y'] = y
+        record['velocity_y'] = velocity_y
+        record['alive'] = np.packbits(np.asarray(alive, dtype=bool))
+        record['flap'] = np.packbits(np.asarray(flaps, dtype=bool))
+
+        self.file.write(self.record.tobytes())
+        self.frame += 1
+
+    def close(self):
+        """
+        Flush and close the replay file.
+        """
+        if not self.file.closed:
+            self.file.close()
+
+
+class Replay:
+    """
+    A recorded episode, memory-mapped so any frame can be read or drawn without re-simulating.
+    """
+
+    def __init__(self, path):
+        """
+        Map a replay file.
+
+        Args:
+            - path (str): The replay file.
+
+        Raises:
+            - ValueError: If the file is not a replay file.
+        """
+        with open(path, 'rb') as f:
+            magic, n_birds, n_pipes, course_seed = REPLAY_HEADER.unpack(f.read(REPLAY_HEADER.size))
+        if magic != REPLAY_MAGIC:
+            raise ValueError(f"{path} is not a valid replay file")
+
+        self.n_birds = n_birds
+        self.n_pipes = n_pipes
+        self.course_seed = None if course_seed < 0 else course_seed
+
+        # A partially written last record, from an interrupted episode, is ignored
+        dtype = frame_dtype(n_birds, n_pipes)
+        n_frames = (os.path.getsize(path) - REPLAY_HEADER.size) // dtype.itemsize
+        self.frames = np.memmap(path, dtype=dtype, mode='r', offset=REPLAY_HEADER.size, shape=(n_frames,)) \
+            if n_frames > 0 else np.zeros(0, dtype=dtype)
+
+    def __len__(self):
+        """
+        Returns:
+            - int: Number of recorded frames.
+        """
+        return len(self.frames)
+
+    def __getitem__(self, index):
+        """
+        Get the record of a frame.
+
+        Args:
+            - index (int): Index of the frame.
+
+        Returns:
+            - np.void: The record, with the fields of frame_dtype.
+        """
+        return self.frames[index]
+
+    def alive(self, index):
+        """
+        Args:
+            - index (int): Index of the frame.
+
+        Returns:
+            - np.ndarray: Boolean array of the birds alive in the frame.
+        """
+        return np.unpackbits(self.frames[index]['alive'], count=self.n_birds).astype(bool)
+
+    def flaps(self, index):
+        """
+        Args:
+            - index (int): Index of the frame.
+
+        Returns:
+            - np.ndarray: Boolean array of the birds that flapped in the frame.
+        """
+        return np.unpackbits(self.frames[index]['flap'], count=self.n_birds).astype(bool)
+
+    def draw(self, screen, index):
+        """
+        Draw the pipes and living birds of a frame onto the screen.
+
+        Args:
+            - screen (pygame.Surface): The surface to draw on.
+            - index (int): Index of the frame.
+
+        Returns:
+            - list[pygame.Rect]: The areas of the screen that were drawn.
+        """
+        record = self.frames[index]
+        drawn = []
+
+        for x, y, y_rotate in zip(record['pipe_x'], record['pipe_y'], record['pipe_y_rotate']):
+            if not np.isnan(x):
+                drawn.append(screen.blit(get_image(TUBE_IMAGE), (float(x), float(y))))
+                drawn.append(screen.blit(get_image(TUBE_IMAGE_REVERSE), (float(x), float(y_rotate))))
+
+        # Birds going up flap their wings
+        images = [get_image(image) for image in BIRD_IMAGES]
+        for i in np.flatnonzero(self.alive(index)):
+            image = images[index % len(images)] if record['velocity_y'][i] < 0 else images[0]
+            drawn.append(screen.blit(image, (int(record['bird_x'][i]), int(record['bird_y'][i]))))
+
+        return drawn
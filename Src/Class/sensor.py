@@ -0,0 +1,121 @@
+import numpy as np
+import pygame
+
+# Variable
+from .bird import bird_size
+from .pipe import pipe_width, pipe_height
+from ..color import RED, BLUE
+
+# Geometry of the 8 sensor lines, cached once as offsets from the truncated rects.
+# A line goes from a corner of the bird to a corner of the gap: lines on the
+# bottom edge of the bird point to the top of the lower pipe, the others to
+# the bottom of the upper pipe.
+SENSOR_BOTTOM = np.array([True, False, True, False, True, False, True, False])
+BIRD_SIDE = np.array([1, 1, -1, -1, -1, -1, 1, 1])
+PIPE_SIDE = np.array([-1, -1, 1, 1, -1, -1, 1, 1])
+
+BIRD_DX = bird_size[0] // 2 + BIRD_SIDE * (bird_size[0] / 2)
+BIRD_DY = np.where(SENSOR_BOTTOM, bird_size[1], 0)
+PIPE_DX = pipe_width // 2 + PIPE_SIDE * (pipe_width / 2)
+PIPE_DY = np.where(SENSOR_BOTTOM, 0, pipe_height)
+
+
+def sensor_points(x, y, tube):
+    """
+    Get the endpoints of the 8 sensor lines between every bird and a tube.
+
+    Args:
+        - x (np.ndarray): Horizontal position of every bird.
+        - y (np.ndarray): Vertical position of every bird.
+        - tube (Tube): The tube the sensors point to.
+
+    Returns:
+        - tuple of np.ndarray: x1, y1, x2, y2 arrays of shape (n_birds, 8).
+    """
+    return gap_points(x, y, tube.position[0], tube.position[1], tube.position_rotate[1])
+
+
+def gap_points(x, y, tube_x, tube_y, tube_y_rotate):
+    """
+    Get the endpoints of the 8 sensor lines between every bird and a tube given by its coordinates.
+
+    Args:
+        - x (np.ndarray): Horizontal position of every bird.
+        - y (np.ndarray): Vertical position of every bird.
+        - tube_x (float or np.ndarray): Horizontal position of the tube, or of the tube of every bird.
+        - tube_y (float or np.ndarray): Top of the lower half of the tube.
+        - tube_y_rotate (float or np.ndarray): Top of the upper half of the tube.
+
+    Returns:
+        - tuple of np.ndarray: x1, y1, x2, y2 arrays of shape (n_birds, 8).
+    """
+    # Rects are truncated like pygame.Rect
+    left = np.trunc(np.asarray(x, dtype=float))[:, None]
+    top = np.trunc(np.asarray(y, dtype=float))[:, None]
+
+    tube_left = np.trunc(np.asarray(tube_x, dtype=float)).reshape(-1, 1)
+    tube_top = np.where(SENSOR_BOTTOM, np.trunc(np.asarray(tube_y, dtype=float)).reshape(-1, 1),
+                        np.trunc(np.asarray(tube_y_rotate, dtype=float)).reshape(-1, 1))
+
+    x1 = left + BIRD_DX
+    y1 = top + BIRD_DY
+    x2 = np.broadcast_to(tube_left + PIPE_DX, x1.shape)
+    y2 = np.broadcast_to(tube_top + PIPE_DY, x1.shape)
+
+    return x1, y1, x2, y2
+
+
+def sensor_distances(x, y, tube):
+    """
+    Calculate the 8 sensor distances between every bird and a tube.
+
+    Args:
+        - x (np.ndarray): Horizontal position of every bird.
+        - y (np.ndarray): Vertical position of every bird.
+        - tube (Tube): The tube the sensors point to.
+
+    Returns:
+        - np.ndarray: Distances of shape (n_birds, 8).
+    """
+    x1, y1, x2, y2 = sensor_points(x, y, tube)
+    return np.hypot(x1 - x2, y1 - y2)
+
+
+def gap_distances(x, y, tube_x, tube_y, tube_y_rotate):
+    """
+    Calculate the 8 sensor distances between every bird and a tube given by its coordinates.
+
+    Args:
+        - x (np.ndarray): Horizontal position of every bird.
+        - y (np.ndarray): Vertical position of every bird.
+        - tube_x (float or np.ndarray): Horizontal position of the tube, or of the tube of every bird.
+        - tube_y (float or np.ndarray): Top of the lower half of the tube.
+        - tube_y_rotate (float or np.ndarray): Top of the upper half of the tube.
+
+    Returns:
+        - np.ndarray: Distances of shape (n_birds, 8).
+    """
+    x1, y1, x2, y2 = gap_points(x, y, tube_x, tube_y, tube_y_rotate)
+    return np.hypot(x1 - x2, y1 - y2)
+
+
+def draw_sensor_lines(screen, x, y, tube):
+    """
+    Draw the sensor lines of some birds on the screen, as an optional overlay.
+
+    Args:
+        - screen (pygame.Surface): The surface to draw the lines on.
+        - x (np.ndarray): Horizontal position of the birds to draw.
+        - y (np.ndarray): Vertical position of the birds to draw.
+        - tube (Tube): The tube the sensors point to.
+
+    Returns:
+        - list[pygame.Rect]: The areas of the screen that were drawn.
+    """
+    x1, y1, x2, y2 = sensor_points(x, y, tube)
+
+    drawn = []
+    for i, j in np.ndindex(x1.shape):
+        color = RED if SENSOR_BOTTOM[j] else BLUE
+        drawn.append(pygame.draw.line(screen, color, (x1[i, j], y1[i, j]), (x2[i, j], y2[i, j]), 2))
+    return drawn
@@ -0,0 +1,96 @@
+# Variable
+from .pipe import Tube
+
+
+class TubeRing:
+    """
+    A fixed-size ring buffer of the tubes still on screen, plus the one about to enter it.
+
+    Tubes keep the absolute index they would have in an ever-growing list, so
+    ring[score] and ring[-1] work as before, while tubes that leave the screen
+    are retired and their Tube objects recycled for the next spawns.
+    """
+
+    def __init__(self, capacity=8):
+        """
+        Initialize an empty ring.
+
+        Args:
+            - capacity (int, optional): Maximum number of live tubes (default is 8).
+        """
+        self.capacity = capacity
+        self.slots = []
+        self.first = 0  # Absolute index of the oldest live tube
+        self.spawned = 0  # Number of tubes spawned so far
+
+    def __len__(self):
+        """
+        Returns:
+            - int: Number of live tubes.
+        """
+        return self.spawned - self.first
+
+    def __getitem__(self, index):
+        """
+        Get a live tube by its absolute index, negative indices count from the newest tube.
+
+        Args:
+            - index (int): Absolute index of the tube.
+
+        Returns:
+            - Tube: The tube.
+
+        Raises:
+            - IndexError: If the tube was retired or not spawned yet.
+        """
+        if index < 0:
+            index += self.spawned
+        if not self.first <= index < self.spawned:
+            raise IndexError(f"Tube {index} is not live")
+        return self.slots[index % self.capacity]
+
+    def __iter__(self):
+        """
+        Iterate over the live tubes, oldest first.
+        """
+        for index in range(self.first, self.spawned):
+            yield self.slots[index % self.capacity]
+
+    def spawn(self, v_delta, x_velocity, delta):
+        """
+        Spawn a tube at the right border, recycling the slot of a retired tube.
+
+        Args:
+            - v_delta (int): Vertical gap parameter of the tube.
+            - x_velocity (int): Horizontal velocity of the tube.
+            - delta (int): Vertical variation of the tube.
+
+        Returns:
+            - Tube: The new tube.
+        """
+        if len(self) == self.capacity:
+            self.first += 1
+
+        slot = self.spawned % self.capacity
+        if slot < len(self.slots):
+            tube = self.slots[slot]
+            tube.reset(v_delta, x_velocity, delta)
+        else:
+            tube = Tube(v_delta, x_velocity, delta)
+            self.slots.append(tube)
+
+        self.spawned += 1
+        return tube
+
+    def update(self, dt):
+        """
+        Move the live tubes and retire the ones that left the screen, always keeping the newest.
+
+        Args:
+            - dt (float): Time elapsed since the last update.
+        """
+        for tube in self:
+            tube.update(dt)
+
+        while len(self) > 1 and self.slots[self.first % self.capacity].offscreen():
+            self.first += 1
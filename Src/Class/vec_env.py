@@ -0,0 +1,219 @@
+import random
+
+import numpy as np
+
+# Variable
+from .flock import Flock
+from .course import Course, get_course
+from .pipe import pipe_width, pipe_height
+from .sensor import gap_distances
+from .collision import collide_arrays
+from ..constant import WINDOW_HEIGHT, WINDOW_WIDTH, FIXED_DT
+
+N_OBSERVATIONS = 13  # x, y, jump strength, gravity, vertical velocity and 8 sensor distances
+
+
+class FlippyVecEnv:
+    """
+    N independent Flippy Bird worlds with one bird each, stepped together with NumPy.
+
+    Every world has its own pipe course, tubes and difficulty, with the rules of
+    run_ai.py: a bird earns 0.1 per frame alive, 1 per pipe passed and loses 3 when
+    it dies, and every 4 pipes its world gets harder. No display is needed.
+
+    reset(seeds) returns the observations, the 13 network inputs of run_ai.py, and
+    step(actions) takes one flap decision per world and returns observations, rewards,
+    done flags and an info dict. The return of an episode equals its run_ai.py fitness.
+    Finished worlds stay done until the next reset.
+    """
+
+    def __init__(self, n_envs, v_delta=160, dt=FIXED_DT, max_frames=None, capacity=8):
+        """
+        Initialize the environment, call reset() before stepping it.
+
+        Args:
+            - n_envs (int): Number of worlds.
+            - v_delta (int, optional): Initial vertical gap parameter of the tubes (default is 160).
+            - dt (float, optional): Time delta of every step (default is FIXED_DT).
+            - max_frames (int, optional): Frames after which a world is done, None for no limit.
+            - capacity (int, optional): Maximum number of live tubes per world (default is 8).
+        """
+        self.n_envs = n_envs
+        self.initial_v_delta = v_delta
+        self.dt = dt
+        self.max_frames = max_frames
+        self.capacity = capacity
+        self.rows = np.arange(n_envs)
+
+    def reset(self, seeds=None):
+        """
+        Start a new episode in every world.
+
+        Args:
+            - seeds (list[int], optional): Seed of the pipe course of every world, None entries
+              (or None for all) pick a random course.
+
+        Returns:
+            - np.ndarray: Observations of shape (n_envs, 13).
+        """
+        if seeds is None:
+            seeds = [None] * self.n_envs
+        self.courses = [Course(random.randrange(2 ** 32)) if seed is None else get_course(seed) for seed in seeds]
+
+        n, k = self.n_envs, self.capacity
+        self.flock = Flock(n)
+        self.v_delta = np.full(n, float(self.initial_v_delta))
+        self.x_velocity = np.zeros(n)
+        self.score = np.zeros(n, dtype=int)
+        self.frame = 0
+        self.done = np.zeros(n, dtype=bool)
+
+        # Tubes of every world, in ring slots indexed by absolute tube index % capacity
+        self.tube_x = np.zeros((n, k))
+        self.tube_y = np.zeros((n, k))
+        self.tube_y_rotate = np.zeros((n, k))
+        self.tube_velocity = np.zeros((n, k))
+        self.first = np.zeros(n, dtype=int)
+        self.spawned = np.zeros(n, dtype=int)
+
+        self._spawn(np.ones(n, dtype=bool))
+        self._advance()
+        return self._observe()
+
+    def step(self, actions):
+        """
+        Apply one flap decision per world and advance every world by one frame.
+
+        Args:
+            - actions (np.ndarray): Boolean array, True for the worlds whose bird flaps.
+
+        Returns:
+            - tuple: Observations (n_envs, 13), rewards (n_envs,), done flags (n_envs,) and
+              an info dict with the score of every world.
+        """
+        running = ~self.done
+        rewards = np.where(running, 0.1, 0.0)
+
+        flaps = np.asarray(actions, dtype=bool) & running
+        if flaps.any():
+            self.flock.flap_up(flaps)
+
+        # Birds that hit a tube of their world die
+        dead = self._collide() & running
+        rewards[dead] -= 3
+        self.done |= dead
+        self.flock.alive &= ~dead
+
+        # Passing the next tube, every 4 pipes the world gets harder
+        next_x = self.tube_x[self.rows, self.score % self.capacity]
+        passed = ~self.done & (self.flock.x > next_x + pipe_width)
+        rewards[passed] += 1
+        self.score[passed] += 1
+        self._increment_diff(passed & (self.score % 4 == 1))
+
+        self._advance()
+        if self.max_frames is not None and self.frame >= self.max_frames:
+            self.done[:] = True
+
+        return self._observe(), rewards, self.done.copy(), {'score': self.score.copy()}
+
+    def _advance(self):
+        """
+        Move the birds and tubes by one fixed timestep, retire offscreen tubes and spawn new ones.
+        """
+        self.frame += 1
+        self.flock.update(self.dt)
+        self.tube_x -= self.tube_velocity * self.dt
+
+        # Retire offscreen tubes, always keeping the newest
+        while True:
+            oldest = self.first % self.capacity
+            retire = (self.spawned - self.first > 1) & (self.tube_x[self.rows, oldest] + pipe_width < 0)
+            if not retire.any():
+                break
+            self.first[retire] += 1
+
+        newest = (self.spawned - 1) % self.capacity
+        self._spawn(self.tube_x[self.rows, newest] < 400)
+
+    def _spawn(self, mask):
+        """
+        Spawn a tube at the right border of the selected worlds, with the next gap of their course.
+
+        Args:
+            - mask (np.ndarray): Boolean array selecting the worlds.
+        """
+        worlds = np.flatnonzero(mask)
+        if len(worlds) == 0:
+            return
+
+        delta = np.array([self.courses[w][self.spawned[w]] for w in worlds], dtype=float)
+        slot = self.spawned[worlds] % self.capacity
+        v_delta = self.v_delta[worlds]
+
+        self.first[worlds] += self.spawned[worlds] - self.first[worlds] == self.capacity
+        self.tube_x[worlds, slot] = WINDOW_WIDTH
+        self.tube_y[worlds, slot] = WINDOW_HEIGHT - pipe_height + v_delta + delta
+        self.tube_y_rotate[worlds, slot] = -(v_delta - delta)
+        self.tube_velocity[worlds, slot] = 15 + self.x_velocity[worlds]
+        self.spawned[worlds] += 1
+
+    def _live(self):
+        """
+        Returns:
+            - np.ndarray: Boolean array of shape (n_envs, capacity) selecting the live tube slots.
+        """
+        index = np.arange(self.capacity)
+        age = (self.spawned[:, None] - 1 - index) % self.capacity
+        return age < (self.spawned - self.first)[:, None]
+
+    def _collide(self):
+        """
+        Returns:
+            - np.ndarray: Boolean array, True for the birds that hit a tube of their world.
+        """
+        return collide_arrays(self.flock.x, self.flock.y, self.flock.size,
+                              self.tube_x, self.tube_y, self.tube_y_rotate, self._live())
+
+    def _increment_diff(self, mask):
+        """
+        Make the selected worlds harder, with the rules of increment_diff in run_ai.py.
+
+        Args:
+            - mask (np.ndarray): Boolean array selecting the worlds.
+        """
+        worlds = np.flatnonzero(mask)
+        if len(worlds) == 0:
+            return
+
+        # Variabili massime
+        max_v_delta = 110
+        max_y_velocity = 20
+        max_gravity = 20
+        max_jump_strength = -30
+
+        # Aggiornamento velocita di tutti i tubi
+        newest = (self.spawned[worlds] - 1) % self.capacity
+        faster = worlds[self.tube_velocity[worlds, newest] > max_y_velocity]
+        self.tube_velocity[faster] += 5 * self._live()[faster]
+        self.x_velocity[worlds] = self.tube_velocity[worlds, newest] - 15
+        self.v_delta[worlds] -= 5
+
+        # Aggiornaemento velocita player
+        flock = self.flock
+        flock.jump_strength[worlds] = np.minimum(flock.jump_strength[worlds] + 2, max_jump_strength)
+        flock.gravity[worlds] = np.where(flock.gravity[worlds] < max_gravity, max_gravity, flock.gravity[worlds] - 0.5)
+        self.v_delta[worlds] = np.maximum(self.v_delta[worlds], max_v_delta)
+
+    def _observe(self):
+        """
+        Returns:
+            - np.ndarray: The 13 network inputs of every world, sensors pointing to its next tube.
+        """
+        slot = self.score % self.capacity
+        distances = gap_distances(self.flock.x, self.flock.y, self.tube_x[self.rows, slot],
+                                  self.tube_y[self.rows, slot], self.tube_y_rotate[self.rows, slot])
+
+        flock = self.flock
+        return np.column_stack((flock.x, flock.y, flock.jump_strength, flock.gravity, flock.velocity_y,
+                                distances * 1.3))
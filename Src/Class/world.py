@@ -0,0 +1,80 @@
+import random
+
+# Variable
+from .pipe import Tube
+from .tube_ring import TubeRing
+from .course import Course, get_course
+from .clock import SimClock
+from ..constant import FIXED_DT
+
+
+class World:
+    """
+    The deterministic state of one game: pipe course, difficulty and simulation clock.
+    """
+
+    def __init__(self, v_delta, seed=None, dt=FIXED_DT):
+        """
+        Initialize the world with a single tube.
+
+        Args:
+            - v_delta (int): Initial vertical gap parameter of the tubes.
+            - seed (int, optional): Seed of the pipe course, None for a random course.
+            - dt (float, optional): Time delta of every step (default is FIXED_DT).
+        """
+        if seed is None:
+            self.course = Course(random.randrange(2 ** 32))
+        else:
+            self.course = get_course(seed)
+        self.clock = SimClock(dt)
+        self.v_delta = v_delta
+        self.x_velocity = 0
+        self.score = 0
+        self.tube_index = 0
+        self.tube_list = TubeRing()
+        self.new_tube()
+
+    def new_tube(self):
+        """
+        Spawn a tube with the current difficulty and the next gap of the course.
+
+        Returns:
+            - Tube: The new tube.
+        """
+        delta = self.course[self.tube_list.spawned]
+        return self.tube_list.spawn(self.v_delta, self.x_velocity, delta)
+
+    def step(self, players):
+        """
+        Advance the players and tubes by one fixed timestep and spawn new tubes.
+
+        Args:
+            - players (list[Player]): The players to update.
+
+        Returns:
+            - float: The time delta used for the step.
+        """
+        dt = self.clock.tick()
+
+        for player in players:
+            player.update(dt)
+
+        self.tube_list.update(dt)
+
+        if self.tube_list[-1].position[0] < 400:
+            self.new_tube()
+            self.tube_index += 1
+
+        return dt
+
+    def passed(self, player):
+        """
+        Check if the player has gone past the next tube.
+
+        Args:
+            - player (Player): The player object.
+
+        Returns:
+            - bool: True if the player is past the tube at index score.
+        """
+        return player.position[0] > self.tube_list[self.score].position[0] + Tube.size[0]
@@ -1,3 +1,7 @@
 FPS = 120
 WINDOW_WIDTH = 576
-WINDOW_HEIGHT = 512
\ No newline at end of file
+WINDOW_HEIGHT = 512
+# Physics step, in the same units as clock.tick(FPS) / 100
+FIXED_DT = 10 / FPS
+# Seconds of game time per unit of dt
+DT_SECONDS = 0.1
@@ -0,0 +1,214 @@
+import os
+import json
+import time
+import argparse
+import neat
+import pygame
+import numpy as np
+
+from Src.Class.bird import Player
+from Src.Class.flock import Flock
+from Src.Class.network import BatchNetwork
+from Src.Class.sensor import sensor_distances
+from Src.Class.world import World
+from Src.Class.back import BACKGROUND_IMAGE
+from Src.Class.assets import get_image
+from Src.Class.budget import EpisodeBudget
+from Src.constant import WINDOW_HEIGHT, WINDOW_WIDTH
+
+import run_ai
+
+
+STAGES = ('physics', 'sensors', 'inference', 'collision', 'rendering')
+EPISODE_FRAMES = 5000  # Frame budget of the episodes of the training benchmark
+
+
+def load_config(config_file, pop_size):
+    """
+    Load the NEAT configuration with a different population size.
+
+    Args:
+        - config_file (str): Path to the NEAT configuration file.
+        - pop_size (int): Number of genomes per generation.
+
+    Returns:
+        - neat.Config: The configuration.
+    """
+    config = neat.config.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                                neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                                config_file)
+    config.pop_size = pop_size
+    return config
+
+
+def bench_single_bird(frames, seed=0):
+    """
+    Measure the frame rate of one Player in a World, as in run.py without the window.
+
+    The bird flaps whenever it falls below the gap of the next tube, and the world restarts when it dies.
+
+    Args:
+        - frames (int): Number of frames to simulate.
+        - seed (int, optional): Seed of the pipe course (default is 0).
+
+    Returns:
+        - dict: The benchmark result.
+    """
+    world = World(200, seed)
+    player = Player()
+
+    start = time.perf_counter()
+    for frame in range(frames):
+        world.step([player])
+        tube = world.tube_list[world.score]
+
+        if world.passed(player):
+            world.score += 1
+
+        sensor_distances([player.position[0]], [player.position[1]], tube)
+        if player.position[1] > tube.position[1] - 60:
+            player.flap_up()
+
+        rect = player.get_rect()
+        if any(rect.colliderect(t.get_rect()) or rect.colliderect(t.get_rect_reverse()) for t in world.tube_list):
+            world = World(200, seed)
+            player = Player()
+
+    elapsed = time.perf_counter() - start
+    return {'benchmark': 'single_bird', 'frames': frames, 'seconds': elapsed, 'fps': frames / elapsed}
+
+
+def bench_population(config, n_birds, frames, render=False, seed=0):
+    """
+    Measure the frame rate of a Flock of n_birds birds and the time spent in every stage of a frame.
+
+    Birds never die, so every frame costs the same for the whole run.
+
+    Args:
+        - config (neat.Config): The NEAT configuration, pop_size is the number of networks.
+        - n_birds (int): Number of birds.
+        - frames (int): Number of frames to simulate.
+        - render (bool, optional): Also draw every frame on an offscreen surface (default is False).
+        - seed (int, optional): Seed of the pipe course (default is 0).
+
+    Returns:
+        - dict: The benchmark result, with the mean milliseconds per frame of every stage.
+    """
+    genomes = list(neat.Population(config).population.values())
+    network = BatchNetwork.create(genomes, config)
+    world = World(160, seed)
+    flock = Flock(n_birds)
+    surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT)) if render else None
+    background_image = get_image(BACKGROUND_IMAGE) if render else None
+    alive = np.arange(n_birds)
+    stage_time = dict.fromkeys(STAGES, 0.0)
+
+    for frame in range(frames):
+        t0 = time.perf_counter()
+        world.step([flock])
+        tube_list = world.tube_list
+        if flock.x[0] > tube_list[world.score].position[0] + tube_list[world.score].size[0]:
+            world.score += 1
+
+        t1 = time.perf_counter()
+        distances = flock.distances(tube_list[world.score])
+        input_data = np.column_stack((flock.x, flock.y, flock.jump_strength,
+                                      flock.gravity, flock.velocity_y, distances * 1.3))
+
+        t2 = time.perf_counter()
+        output = network.activate(input_data, alive)
+        flock.flap_up(output[:, 0] > 0.995)
+
+        t3 = time.perf_counter()
+        flock.collide_tubes(tube_list)
+
+        t4 = time.perf_counter()
+        if render:
+            surface.blit(background_image, (0, 0))
+            surface.blit(background_image, (288, 0))
+            flock.draw(surface)
+            for tube in tube_list:
+                tube.draw(surface)
+
+        t5 = time.perf_counter()
+        for stage, (begin, end) in zip(STAGES, ((t0, t1), (t1, t2), (t2, t3), (t3, t4), (t4, t5))):
+            stage_time[stage] += end - begin
+
+    elapsed = sum(stage_time.values())
+    return {
+        'benchmark': 'population',
+        'n_birds': n_birds,
+        'frames': frames,
+        'render': render,
+        'seconds': elapsed,
+        'fps': frames / elapsed,
+        'activations_per_sec': n_birds * frames / stage_time['inference'],
+        'ms_per_frame': {stage: 1000 * stage_time[stage] / frames for stage in STAGES},
+    }
+
+
+def bench_generations(config, generations, seed=0, max_frames=EPISODE_FRAMES):
+    """
+    Measure how many generations per minute the headless training loop of run_ai.py completes.
+
+    Args:
+        - config (neat.Config): The NEAT configuration, pop_size is the population size.
+        - generations (int): Number of generations to run.
+        - seed (int, optional): Base seed of the pipe courses (default is 0).
+        - max_frames (int, optional): Frame budget of every episode, so a good population cannot
+          stall the benchmark (default is EPISODE_FRAMES).
+
+    Returns:
+        - dict: The benchmark result.
+    """
+    saved = run_ai.headless, run_ai.seed, run_ai.log_difficulty, run_ai.episode_budget
+    run_ai.headless, run_ai.seed, run_ai.log_difficulty = True, seed, False
+    run_ai.episode_budget = EpisodeBudget(max_frames=max_frames)
+
+    try:
+        p = neat.Population(config)
+        start = time.perf_counter()
+        p.run(run_ai.eval_genomes, generations)
+        elapsed = time.perf_counter() - start
+    finally:
+        run_ai.headless, run_ai.seed, run_ai.log_difficulty, run_ai.episode_budget = saved
+
+    return {
+        'benchmark': 'generations',
+        'pop_size': config.pop_size,
+        'generations': generations,
+        'max_frames': max_frames,
+        'seconds': elapsed,
+        'generations_per_minute': 60 * generations / elapsed,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Measure the simulation and training throughput of Flippy Bird')
+    parser.add_argument('--sizes', default='50,200,1000,5000', help='comma separated population sizes')
+    parser.add_argument('--frames', type=int, default=500, help='frames per simulation benchmark')
+    parser.add_argument('--generations', type=int, default=3, help='generations per training benchmark, 0 to skip')
+    parser.add_argument('--episode-frames', type=int, default=EPISODE_FRAMES, help='frame budget of every training episode')
+    parser.add_argument('--render', action='store_true', help='include rendering on an offscreen surface')
+    parser.add_argument('--output', default=None, help='write the results to this JSON file')
+    args = parser.parse_args()
+
+    local_dir = os.path.dirname(__file__)
+    config_path = os.path.join(local_dir, 'config.txt')
+    sizes = [int(size) for size in args.sizes.split(',')]
+
+    results = [bench_single_bird(args.frames)]
+    print(json.dumps(results[-1]))
+
+    for size in sizes:
+        config = load_config(config_path, size)
+        results.append(bench_population(config, size, args.frames, args.render))
+        print(json.dumps(results[-1]))
+
+        if args.generations > 0:
+            results.append(bench_generations(config, args.generations, max_frames=args.episode_frames))
+            print(json.dumps(results[-1]))
+
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
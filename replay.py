@@ -0,0 +1,78 @@
+import argparse
+import pygame
+
+from Src.Class.replay import Replay
+from Src.Class.renderer import DirtyRenderer
+from Src.Class.assets import TextCache, get_image
+from Src.Class.back import BACKGROUND_IMAGE
+from Src.constant import WINDOW_HEIGHT, WINDOW_WIDTH, FPS
+from Src.color import BLACK
+
+
+def play(path, speed=1.0, start=0):
+    """
+    Play a recorded episode in the game window.
+
+    Space pauses, the left and right arrows seek one second back and forward, 1 quits.
+
+    Args:
+        - path (str): The replay file.
+        - speed (float, optional): Playback speed, 2 plays twice as fast (default is 1).
+        - start (int, optional): Frame to start from (default is 0).
+    """
+    replay = Replay(path)
+
+    pygame.init()
+    clock = pygame.time.Clock()
+    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    pygame.display.set_caption(f'Flippy Bird - {path}')
+    text_cache = TextCache(pygame.font.Font(None, 36), BLACK)
+    renderer = DirtyRenderer(screen, get_image(BACKGROUND_IMAGE))
+
+    # The position is a float, so slow and fast speeds both advance smoothly
+    position = float(min(max(start, 0), len(replay) - 1))
+    paused = False
+    running = len(replay) > 0
+
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_1:
+                    running = False
+                if event.key == pygame.K_SPACE:
+                    paused = not paused
+                if event.key == pygame.K_LEFT:
+                    position = max(position - FPS, 0)
+                if event.key == pygame.K_RIGHT:
+                    position = min(position + FPS, len(replay) - 1)
+
+        frame = int(position)
+        renderer.begin_frame()
+        renderer.add(replay.draw(screen, frame))
+
+        # Testo a schermo
+        record = replay[frame]
+        lines = [f'Frame: {frame}/{len(replay) - 1}', f'Score: {record["score"]}',
+                 f'Bird: {int(replay.alive(frame).sum())}']
+        for row, line in enumerate(lines):
+            renderer.add(screen.blit(text_cache.render(line), (10, 10 + 25 * row)))
+
+        renderer.end_frame()
+        clock.tick(FPS)
+
+        if not paused:
+            position = min(position + speed, len(replay) - 1)
+
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Play a recorded Flippy Bird episode')
+    parser.add_argument('path', help='replay file written by run.py or run_ai.py with --record')
+    parser.add_argument('--speed', type=float, default=1.0, help='playback speed, 2 plays twice as fast')
+    parser.add_argument('--start', type=int, default=0, help='frame to start from')
+    args = parser.parse_args()
+
+    play(args.path, args.speed, args.start)
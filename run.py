@@ -1,17 +1,26 @@
+import os
+import argparse
 import pygame
 from Src.Class.bird import Player
-from Src.Class.pipe import Tube
-from Src.Class.back import background_image
+from Src.Class.world import World
+from Src.Class.tube_ring import TubeRing
+from Src.Class.sensor import sensor_distances, draw_sensor_lines
+from Src.Class.collision import collide
+from Src.Class.profiler import StageTimer
+from Src.Class.renderer import DirtyRenderer
+from Src.Class.assets import TextCache, get_image
+from Src.Class.replay import ReplayRecorder
+from Src.Class.back import BACKGROUND_IMAGE
 from Src.constant import WINDOW_HEIGHT, WINDOW_WIDTH, FPS
-from Src.color import WHITE, RED, BLUE, BLACK
+from Src.color import WHITE
 
 
 # Global variables
 max_score = []
 game_quit = True
 int_try = 0
-v_delta = 200
-x_velocity = 0
+timer = StageTimer(enabled=False)  # Per-stage timing of the frame loop, enabled by --profile
+record_directory = None  # Directory of the replay of every try, set by --record
 
 
 # Initialize Pygame
@@ -20,28 +29,16 @@ clock = pygame.time.Clock()
 screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
 pygame.display.set_caption('Flippy Bird')
 font = pygame.font.Font(None, 36)
+text_cache = TextCache(font, WHITE)
+renderer = DirtyRenderer(screen, get_image(BACKGROUND_IMAGE))
 
 
 
-def distance_between_points(point1, point2):
-    """
-    Calculate the Euclidean distance between two points in a 2D Cartesian coordinate system.
-
-    Parameters:
-        - point1 (tuple of two floats/integers): The coordinates of the first point as a tuple (x1, y1).
-        - point2 (tuple of two floats/integers): The coordinates of the second point as a tuple (x2, y2).
-
-    Returns:
-        - float: The Euclidean distance between the two points.
-    """
-    return ((point1[0] - point2[0]) ** 2 + (point1[1] - point2[1]) ** 2) ** 0.5
-
 def load_screen():
     """
-    Load background images onto the screen.
+    Restore the background under everything drawn in the last frame.
     """
-    screen.blit(background_image, (0, 0))
-    screen.blit(background_image, (288, 0)) 
+    renderer.begin_frame()
 
 def handle_command(player: Player):
     """Handle user input events.
@@ -63,74 +60,32 @@ def handle_command(player: Player):
                 pygame.quit()
     return is_alive
 
-def get_collidate(player: Player, tube_list: list[Tube], tube_index: int):
-    """Check collision between player and tubes.
-    
-    Args:
-        - player (Player): The player object.
-        - tube_list (list[Tube]): List of Tube objects.
-        - tube_index (int): Index of the current tube in the list.
-    
-    Returns:
-        bool: True if collision occurs, False otherwise.
-    """
-    player_rect = player.get_rect()
-    tube_rect = tube_list[tube_index].get_rect()
-    tube_rectreverse = tube_list[tube_index].get_rect_reverse()
-
-    if player_rect.colliderect(tube_rect) or player_rect.colliderect(tube_rectreverse):
-        return True
-    
-    return False
-
-def update(dt, player: Player, tube_list: list[Tube]):
-    """Update game entities based on delta time.
-    
-    Args:
-        - dt (float): Time elapsed since the last update.
-        - player (Player): The player object.
-        - tube_list (list[Tube]): List of Tube objects.
-    """
-    player.update(dt)
-
-    for tube in tube_list:
-        if not tube.offscreen():
-            tube.update(dt)
-
-def collidate_player(player: Player, tube_list: list[Tube], tube_index: int):
-    """Check if player collides with any tubes.
+def collidate_player(player: Player, tube_list: TubeRing, tube_index: int):
+    """Check if player collides with any live tube.
     
     Args:
         - player (Player): The player object.
-        - tube_list (list[Tube]): List of Tube objects.
+        - tube_list (TubeRing): The live Tube objects.
         - tube_index (int): Index of the current tube in the list.
     
     Returns:
-        bool: True if player collides, False otherwise.
+        bool: False if the player collides, True otherwise.
     """
-    is_alive = True
-
-    if get_collidate(player, tube_list, tube_index-1):
+    if collide([player.position[0]], [player.position[1]], player.size, tube_list)[0]:
         max_score.append(tube_index)
-        is_alive = False
-
-    if tube_index > 2:
-        if get_collidate(player, tube_list, tube_index-2):
-            max_score.append(tube_index)
-            is_alive = False
+        return False
 
-    return is_alive
+    return True
 
-def increment_diff(player: Player, tube_list: list[Tube]):
+def increment_diff(player: Player, world: World):
     """
     Adjust the difficulty of the game by modifying the velocity parameters based on player interactions and tube positions.
 
     Parameters:
         - player (Player): The player object, which typically contains attributes such as score, position, etc.
-        - tube_list (list of Tube): A list of Tube objects, where each Tube represents an obstacle in the game.
+        - world (World): The world whose tubes and difficulty are updated.
     """
-
-    global v_delta, x_velocity
+    tube_list = world.tube_list
     
     # Variabili massime
     max_v_delta = 110
@@ -139,11 +94,11 @@ def increment_diff(player: Player, tube_list: list[Tube]):
     max_jump_strength = -24
 
     # Aggiornamento velocita di tutti i tubi
-    for i in range(len(tube_list)):
-        if tube_list[-1].velocity_y > max_y_velocity:
-            tube_list[i].velocity_y += 5
-    x_velocity = tube_list[-1].velocity_y - 15
-    v_delta -= 5
+    if tube_list[-1].velocity_y > max_y_velocity:
+        for tube in tube_list:
+            tube.velocity_y += 5
+    world.x_velocity = tube_list[-1].velocity_y - 15
+    world.v_delta -= 5
 
     # Aggiornaemento velocita player
     player.gravity -= 0.5
@@ -155,11 +110,11 @@ def increment_diff(player: Player, tube_list: list[Tube]):
     if player.gravity < max_gravity:
         player.gravity = max_gravity
 
-    if v_delta < max_v_delta:
-        v_delta = max_v_delta
+    if world.v_delta < max_v_delta:
+        world.v_delta = max_v_delta
 
 
-    #print("J: ", player.jump_strength,  "G: ", player.gravity, "X_V: ", x_velocity, "V_D: ", v_delta, "Y_V: ", tube_list[-1].velocity_y)
+    #print("J: ", player.jump_strength,  "G: ", player.gravity, "X_V: ", world.x_velocity, "V_D: ", world.v_delta, "Y_V: ", tube_list[-1].velocity_y)
 
 def update_text_screen(score):
     """Update and display text on the screen.
@@ -167,133 +122,101 @@ def update_text_screen(score):
     Args:
         score (int): Current score of the game.
     """
-    try_text = font.render(f'Try: {int_try}', True, (255, 255, 255))
-    screen.blit(try_text, (10, 10)) 
+    try_text = text_cache.render(f'Try: {int_try}')
+    renderer.add(screen.blit(try_text, (10, 10)))
 
-    score_text = font.render(f'Score: {score}', True, (255, 255, 255))
-    screen.blit(score_text, (10, 35)) 
+    score_text = text_cache.render(f'Score: {score}')
+    renderer.add(screen.blit(score_text, (10, 35)))
 
     if len(max_score) > 0:
-        max_score_text = font.render(f'Max Score: {max(max_score)}', True, (255, 255, 255))
-        screen.blit(max_score_text, (10, 60)) 
-
-def calculate_distances_and_draw_lines(player, tube_list, score):
-    """
-    Calculate distances between specified points of the player and the tubes, and draw lines on the screen.
-
-    Parameters:
-        - player (Player): The player object.
-        - tube_list (list of Tube): A list of Tube objects.
-        - score (int): The current score, used to index the tube_list.
-
-    Returns:
-        - list of float: A list of distances calculated between specified points of the player and tubes.
-    """
-    
-    distances = []
-
-    # Line 1
-    p1 = (player.get_rect().midbottom[0] + player.size[0] / 2, player.get_rect().midbottom[1])
-    p2 = (tube_list[score].get_rect().midtop[0] - Tube.size[0] / 2, tube_list[score].get_rect().midtop[1])
-    pygame.draw.line(screen, RED, p1, p2, 2)
-    distances.append(distance_between_points(p1, p2))
-
-    # Line 2
-    p1 = (player.get_rect().midtop[0] + player.size[0] / 2, player.get_rect().midtop[1])
-    p2 = (tube_list[score].get_rect_reverse().midbottom[0] - Tube.size[0] / 2, tube_list[score].get_rect_reverse().midbottom[1])
-    pygame.draw.line(screen, BLUE, p1, p2, 2)
-    distances.append(distance_between_points(p1, p2))
-
-    # Line 3
-    p1 = (player.get_rect().midbottom[0] - player.size[0] / 2, player.get_rect().midbottom[1])
-    p2 = (tube_list[score].get_rect().midtop[0] + Tube.size[0] / 2, tube_list[score].get_rect().midtop[1])
-    pygame.draw.line(screen, RED, p1, p2, 2)
-    distances.append(distance_between_points(p1, p2))
-
-    # Line 4
-    p1 = (player.get_rect().midtop[0] - player.size[0] / 2, player.get_rect().midtop[1])
-    p2 = (tube_list[score].get_rect_reverse().midbottom[0] + Tube.size[0] / 2, tube_list[score].get_rect_reverse().midbottom[1])
-    pygame.draw.line(screen, BLUE, p1, p2, 2)
-    distances.append(distance_between_points(p1, p2))
-
-    # Line 5
-    p1 = (player.get_rect().midbottom[0] - player.size[0] / 2, player.get_rect().midbottom[1])
-    p2 = (tube_list[score].get_rect().midtop[0] - Tube.size[0] / 2, tube_list[score].get_rect().midtop[1])
-    pygame.draw.line(screen, RED, p1, p2, 2)
-    distances.append(distance_between_points(p1, p2))
-
-    # Line 6
-    p1 = (player.get_rect().midtop[0] - player.size[0] / 2, player.get_rect().midtop[1])
-    p2 = (tube_list[score].get_rect_reverse().midbottom[0] - Tube.size[0] / 2, tube_list[score].get_rect_reverse().midbottom[1])
-    pygame.draw.line(screen, BLUE, p1, p2, 2)
-    distances.append(distance_between_points(p1, p2))
-
-    # Line 7
-    p1 = (player.get_rect().midbottom[0] + player.size[0] / 2, player.get_rect().midbottom[1])
-    p2 = (tube_list[score].get_rect().midtop[0] + Tube.size[0] / 2, tube_list[score].get_rect().midtop[1])
-    pygame.draw.line(screen, RED, p1, p2, 2)
-    distances.append(distance_between_points(p1, p2))
-
-    # Line 8
-    p1 = (player.get_rect().midtop[0] + player.size[0] / 2, player.get_rect().midtop[1])
-    p2 = (tube_list[score].get_rect_reverse().midbottom[0] + Tube.size[0] / 2, tube_list[score].get_rect_reverse().midbottom[1])
-    pygame.draw.line(screen, BLUE, p1, p2, 2)
-    distances.append(distance_between_points(p1, p2))
-
-    return distances
+        max_score_text = text_cache.render(f'Max Score: {max(max_score)}')
+        renderer.add(screen.blit(max_score_text, (10, 60)))
 
 
 def run():
-    global game_quit, v_delta, x_velocity
+    global game_quit
 
-    score = 0
-    tube_index = 0
-    tube_list = [Tube(v_delta, x_velocity)]
+    world = World(200)
+    tube_list = world.tube_list
     player = Player()
     is_alive = True
 
+    timer.reset()
+    renderer.invalidate()
+
+    recorder = None
+    if record_directory is not None:
+        recorder = ReplayRecorder(os.path.join(record_directory, f'try-{int_try}.rpl'), 1,
+                                  world.course.seed, tube_list.capacity)
+
     while is_alive:
-        dt = clock.tick(FPS) / 100
+        timer.start_frame()
+        last_flap_time = player.last_flap_time
         is_alive = handle_command(player)
+        flapped = player.last_flap_time != last_flap_time
+        timer.mark('input')
 
         load_screen()
+        timer.mark('draw')
 
-        # Aggiornamento player e tubi
-        update(dt, player, tube_list)
+        # Aggiornamento player e tubi, crea nuovi tubi
+        world.step([player])
 
         # Aumenta lo score 
-        if player.position[0] > tube_list[score].position[0] + Tube.size[0] : 
-            score += 1
+        if world.passed(player):
+            world.score += 1
 
-            if score%4 == 1:
-                increment_diff(player, tube_list)
+            if world.score%4 == 1:
+                increment_diff(player, world)
 
-        # Crea nuovi tubie
-        if tube_list[-1].position[0] < 400:
-            tube_list.append(Tube(v_delta, x_velocity))
-            tube_index += 1
+        score = world.score
+        tube_index = world.tube_index
+        timer.mark('update')
 
         # Disegna il tuboe e player sullo schermo
-        player.draw(screen)
+        renderer.add(player.draw(screen))
         for tube in tube_list:
             if not tube.offscreen():
-                tube.draw(screen)
+                renderer.add(tube.draw(screen))
+        timer.mark('draw')
 
         # Get 8 size distance
-        distanze = calculate_distances_and_draw_lines(player, tube_list, score)
+        distanze = sensor_distances([player.position[0]], [player.position[1]], tube_list[score])[0]
+        timer.mark('sensors')
+        renderer.add(draw_sensor_lines(screen, [player.position[0]], [player.position[1]], tube_list[score]))
+        timer.mark('draw')
 
         # Collisione player e tubo
         is_alive = collidate_player(player, tube_list, tube_index)
+        timer.mark('collision')
+
+        if recorder is not None:
+            recorder.write([player.position[0]], [player.position[1]], [player.velocity_y],
+                           [is_alive], [flapped], tube_list, score)
 
         update_text_screen(score)
+        timer.mark('draw')
 
-        pygame.display.flip()
+        renderer.end_frame()
         clock.tick(FPS)
+        timer.mark('flip')
+        timer.end_frame()
+
+    if recorder is not None:
+        recorder.close()
+
+    if timer.enabled:
+        print(f'Try {int_try} timings:', timer.summary())
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Play Flippy Bird')
+    parser.add_argument('--profile', action='store_true', help='print the time spent in every stage of the frame after each try')
+    parser.add_argument('--record', default=None, help='write the replay of every try to this directory')
+    args = parser.parse_args()
+    timer.enabled = args.profile
+    record_directory = args.record
+
     while game_quit:
         int_try += 1
-        v_delta = 200
-        x_velocity = 0
         run()
@@ -1,112 +1,160 @@
 import os
+import time
+import random
+import argparse
 import neat
 import pygame
-
-from Src.Class.bird import Player
+import numpy as np
+
+from Src.Class.flock import Flock
+from Src.Class.network import BatchNetwork, NetworkCache, export_champion
+from Src.Class.sensor import draw_sensor_lines
+from Src.Class.parallel import FlockEvaluator
+from Src.Class.profiler import StageTimer, TelemetryReporter
+from Src.Class.checkpoint import AsyncCheckpointer
+from Src.Class.fitness_cache import FitnessCache
+from Src.Class.budget import EpisodeBudget
+from Src.Class.renderer import DirtyRenderer
+from Src.Class.assets import TextCache, get_image
+from Src.Class.replay import ReplayRecorder
+from Src.Class.vec_env import FlippyVecEnv
+from Src.Class.aggregate import FitnessAggregator, parse_reducer
+from Src.Class.islands import IslandModel, parse_overrides
 from Src.Class.pipe import Tube
-from Src.Class.back import background_image
+from Src.Class.world import World
+from Src.Class.course import cache_courses_on_disk, course_cache_directory
+from Src.Class.tube_ring import TubeRing
+from Src.Class.back import BACKGROUND_IMAGE
 from Src.constant import WINDOW_HEIGHT, WINDOW_WIDTH, FPS
-from Src.color import WHITE, RED, BLUE, BLACK
+from Src.color import BLACK
 
 
 CHECKPOINT_FILE = 'neat-checkpoint1'
+CHAMPION_FILE = 'champion.json'
 
 
 # Global variables
 max_score = []
 int_try = 0
-v_delta = 170
-x_velocity = 0
+headless = False
+seed = None
+courses = 0
+timer = StageTimer(enabled=False)  # Per-stage timing of the frame loop, enabled by --telemetry
+network_cache = NetworkCache()  # Networks of elites and unchanged genomes are reused across generations
+fitness_cache = None  # FitnessCache of seeded courses, enabled by --fitness-cache
+episode_budget = None  # EpisodeBudget that stops long episodes, None to play until every bird dies
+record_directory = None  # Directory of the replay of every episode, None to record nothing
+multi_world = False  # Every genome plays in its own world, set by --multi-world
+reducer = 'mean'  # How the fitness of the fixed courses is combined, set by --reducer
+log_difficulty = True  # Print the new difficulty every time the game gets harder
+
+
+# Pygame handles, left to None when training headless
+clock = None
+screen = None
+font = None
+text_cache = None
+renderer = None
+
+
+def episode_settings():
+    """
+    Collect the settings that change how episodes are played, to hand them to worker processes.
 
+    Worker processes started with spawn or forkserver import this module afresh, so
+    they only see these settings through apply_settings.
 
-# Initialize Pygame
-pygame.init()
-clock = pygame.time.Clock()
-screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-pygame.display.set_caption('Flippy Bird')
-font = pygame.font.Font(None, 36)
+    Returns:
+        - dict: The settings, by global name.
+    """
+    return {
+        'headless': headless,
+        'seed': seed,
+        'courses': courses,
+        'fitness_cache': fitness_cache,
+        'episode_budget': episode_budget,
+        'multi_world': multi_world,
+        'reducer': reducer,
+        'log_difficulty': log_difficulty,
+        'course_directory': course_cache_directory(),
+    }
+
+
+def apply_settings(settings):
+    """
+    Set the globals of a worker process, the initializer of its pool.
+
+    Args:
+        - settings (dict): The settings returned by episode_settings.
+    """
+    global headless, seed, courses, fitness_cache, episode_budget, multi_world, reducer, log_difficulty
 
+    headless = settings['headless']
+    seed = settings['seed']
+    courses = settings['courses']
+    fitness_cache = settings['fitness_cache']
+    episode_budget = settings['episode_budget']
+    multi_world = settings['multi_world']
+    reducer = settings['reducer']
+    log_difficulty = settings['log_difficulty']
+    cache_courses_on_disk(settings['course_directory'])
 
 
-def distance_between_points(point1, point2):
+def init_display():
+    """
+    Initialize Pygame and open the game window.
     """
-    Calculate the Euclidean distance between two points in a 2D Cartesian coordinate system.
+    global clock, screen, font, text_cache, renderer
 
-    Parameters:
-        - point1 (tuple of two floats/integers): The coordinates of the first point as a tuple (x1, y1).
-        - point2 (tuple of two floats/integers): The coordinates of the second point as a tuple (x2, y2).
+    pygame.init()
+    clock = pygame.time.Clock()
+    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    pygame.display.set_caption('Flippy Bird')
+    font = pygame.font.Font(None, 36)
+    text_cache = TextCache(font, BLACK)
+    renderer = DirtyRenderer(screen, get_image(BACKGROUND_IMAGE))
 
-    Returns:
-        - float: The Euclidean distance between the two points.
-    """
-    return ((point1[0] - point2[0]) ** 2 + (point1[1] - point2[1]) ** 2) ** 0.5
 
 def load_screen():
     """
-    Load background images onto the screen.
+    Restore the background under everything drawn in the last frame.
     """
-    screen.blit(background_image, (0, 0))
-    screen.blit(background_image, (288, 0)) 
+    renderer.begin_frame()
 
-def call_flap_up(player: Player):
-    """Handle user input events.
+def call_flap_up(flock: Flock, flaps, show=True):
+    """Make the selected birds flap and handle user input events.
     
     Args:
-        - player (Player): The player object controlled by user input.
-    
-    Returns:
-        bool: True if the game is still running, False if the user quits.
+        - flock (Flock): The population of birds.
+        - flaps (np.ndarray): Boolean array selecting the birds that flap.
+        - show (bool, optional): Whether the game window is open (default is True).
     """
-    player.flap_up()
+    flock.flap_up(flaps)
+
+    if not show:
+        return
 
     for event in pygame.event.get():
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_1:
                 pygame.quit()
 
-def get_collidate(player: Player, tube_list: list[Tube], tube_index: int):
-    """Check collision between player and tubes.
+def collidate_flock(flock: Flock, tube_list: TubeRing, tube_index: int):
+    """Check which living birds collide with the tubes.
     
     Args:
-        - player (Player): The player object.
-        - tube_list (list[Tube]): List of Tube objects.
+        - flock (Flock): The population of birds.
+        - tube_list (TubeRing): The live Tube objects.
         - tube_index (int): Index of the current tube in the list.
     
     Returns:
-        bool: True if collision occurs, False otherwise.
+        np.ndarray: Boolean array, True for the birds that died this frame.
     """
-    player_rect = player.get_rect()
-    tube_rect = tube_list[tube_index].get_rect()
-    tube_rectreverse = tube_list[tube_index].get_rect_reverse()
-
-    if player_rect.colliderect(tube_rect) or player_rect.colliderect(tube_rectreverse):
-        return True
-    
-    return False
-
-def collidate_player(player: Player, tube_list: list[Tube], tube_index: int):
-    """Check if player collides with any tubes.
-    
-    Args:
-        - player (Player): The player object.
-        - tube_list (list[Tube]): List of Tube objects.
-        - tube_index (int): Index of the current tube in the list.
-    
-    Returns:
-        bool: True if player collides, False otherwise.
-    """
-    is_alive = True
-
-    if get_collidate(player, tube_list, tube_index-1):
+    dead = flock.collide_tubes(tube_list)
+    if dead.any():
         max_score.append(tube_index)
-        is_alive = False
-
-    if tube_index > 2:
-        if get_collidate(player, tube_list, tube_index-2):
-            max_score.append(tube_index)
-            is_alive = False
 
-    return is_alive
+    return dead
 
 def update_text_screen(score, n_bird):
     """Update and display text on the screen.
@@ -114,26 +162,26 @@ def update_text_screen(score, n_bird):
     Args:
         score (int): Current score of the game.
     """
-    try_text = font.render(f'Bird: {n_bird}', True, BLACK)
-    screen.blit(try_text, (10, 10)) 
+    try_text = text_cache.render(f'Bird: {n_bird}')
+    renderer.add(screen.blit(try_text, (10, 10)))
 
-    score_text = font.render(f'Score: {score}', True, BLACK)
-    screen.blit(score_text, (10, 35)) 
+    score_text = text_cache.render(f'Score: {score}')
+    renderer.add(screen.blit(score_text, (10, 35)))
 
     if len(max_score) > 0:
-        max_score_text = font.render(f'Max Score: {max(max_score)}', True, BLACK)
-        screen.blit(max_score_text, (10, 60)) 
+        max_score_text = text_cache.render(f'Max Score: {max(max_score)}')
+        renderer.add(screen.blit(max_score_text, (10, 60)))
 
-def increment_diff(player: Player, tube_list: list[Tube]):
+def increment_diff(flock: Flock, index: int, world: World):
     """
     Adjust the difficulty of the game by modifying the velocity parameters based on player interactions and tube positions.
 
     Parameters:
-        - player (Player): The player object, which typically contains attributes such as score, position, etc.
-        - tube_list (list of Tube): A list of Tube objects, where each Tube represents an obstacle in the game.
+        - flock (Flock): The population of birds.
+        - index (int): Index of the bird that passed the tube.
+        - world (World): The world whose tubes and difficulty are updated.
     """
-
-    global v_delta, x_velocity
+    tube_list = world.tube_list
     
     # Variabili massime
     max_v_delta = 110
@@ -142,208 +190,443 @@ def increment_diff(player: Player, tube_list: list[Tube]):
     max_jump_strength = -30
 
     # Aggiornamento velocita di tutti i tubi
-    for i in range(len(tube_list)):
-        if tube_list[-1].velocity_y > max_y_velocity:
-            tube_list[i].velocity_y += 5
-    x_velocity = tube_list[-1].velocity_y - 15
-    v_delta -= 5
+    if tube_list[-1].velocity_y > max_y_velocity:
+        for tube in tube_list:
+            tube.velocity_y += 5
+    world.x_velocity = tube_list[-1].velocity_y - 15
+    world.v_delta -= 5
 
     # Aggiornaemento velocita player
     
-    player.jump_strength += 2
+    flock.jump_strength[index] += 2
 
-    if player.jump_strength > max_jump_strength:
-        player.jump_strength = max_jump_strength
+    if flock.jump_strength[index] > max_jump_strength:
+        flock.jump_strength[index] = max_jump_strength
 
-    if player.gravity < max_gravity:
-        player.gravity = max_gravity
+    if flock.gravity[index] < max_gravity:
+        flock.gravity[index] = max_gravity
     else:
-        player.gravity -= 0.5
+        flock.gravity[index] -= 0.5
 
-    if v_delta < max_v_delta:
-        v_delta = max_v_delta
+    if world.v_delta < max_v_delta:
+        world.v_delta = max_v_delta
 
-    print("DIFF = G: ", player.gravity, "Y_V: ", tube_list[-1].velocity_y, "V_D: ", v_delta, "J: ", player.jump_strength)
+    if log_difficulty:
+        print("DIFF = G: ", flock.gravity[index], "Y_V: ", tube_list[-1].velocity_y, "V_D: ", world.v_delta, "J: ", flock.jump_strength[index])
 
-def calculate_distances_and_draw_lines(player, tube_list, score, show = False):
+def simulate(ge, config, course_seed=None, show=False, replay_path=None):
     """
-    Calculate distances between specified points of the player and the tubes, and draw lines on the screen.
+    Play one episode with a batch of genomes sharing the same world.
 
     Parameters:
-        - player (Player): The player object.
-        - tube_list (list of Tube): A list of Tube objects.
-        - score (int): The current score, used to index the tube_list.
+        - ge (list[neat.DefaultGenome]): The genomes to evaluate.
+        - config (neat.Config): The NEAT configuration.
+        - course_seed (int, optional): Seed of the pipe course, None for a random course.
+        - show (bool, optional): Draw the episode in the game window (default is False).
+        - replay_path (str, optional): Record the episode to this replay file (default is None).
 
     Returns:
-        - list of float: A list of distances calculated between specified points of the player and tubes.
+        - np.ndarray: The fitness of every genome.
     """
-    
-    distances = []
-
-    # Line 1
-    p1 = (player.get_rect().midbottom[0] + player.size[0] / 2, player.get_rect().midbottom[1])
-    p2 = (tube_list[score].get_rect().midtop[0] - Tube.size[0] / 2, tube_list[score].get_rect().midtop[1])
-    if show: pygame.draw.line(screen, RED, p1, p2, 2)
-    distances.append(distance_between_points(p1, p2))
-
-    # Line 2
-    p1 = (player.get_rect().midtop[0] + player.size[0] / 2, player.get_rect().midtop[1])
-    p2 = (tube_list[score].get_rect_reverse().midbottom[0] - Tube.size[0] / 2, tube_list[score].get_rect_reverse().midbottom[1])
-    if show: pygame.draw.line(screen, BLUE, p1, p2, 2)
-    distances.append(distance_between_points(p1, p2))
-
-    # Line 3
-    p1 = (player.get_rect().midbottom[0] - player.size[0] / 2, player.get_rect().midbottom[1])
-    p2 = (tube_list[score].get_rect().midtop[0] + Tube.size[0] / 2, tube_list[score].get_rect().midtop[1])
-    if show: pygame.draw.line(screen, RED, p1, p2, 2)
-    distances.append(distance_between_points(p1, p2))
-
-    # Line 4
-    p1 = (player.get_rect().midtop[0] - player.size[0] / 2, player.get_rect().midtop[1])
-    p2 = (tube_list[score].get_rect_reverse().midbottom[0] + Tube.size[0] / 2, tube_list[score].get_rect_reverse().midbottom[1])
-    if show: pygame.draw.line(screen, BLUE, p1, p2, 2)
-    distances.append(distance_between_points(p1, p2))
-
-    # Line 5
-    p1 = (player.get_rect().midbottom[0] - player.size[0] / 2, player.get_rect().midbottom[1])
-    p2 = (tube_list[score].get_rect().midtop[0] - Tube.size[0] / 2, tube_list[score].get_rect().midtop[1])
-    if show: pygame.draw.line(screen, RED, p1, p2, 2)
-    distances.append(distance_between_points(p1, p2))
-
-    # Line 6
-    p1 = (player.get_rect().midtop[0] - player.size[0] / 2, player.get_rect().midtop[1])
-    p2 = (tube_list[score].get_rect_reverse().midbottom[0] - Tube.size[0] / 2, tube_list[score].get_rect_reverse().midbottom[1])
-    if show: pygame.draw.line(screen, BLUE, p1, p2, 2)
-    distances.append(distance_between_points(p1, p2))
-
-    # Line 7
-    p1 = (player.get_rect().midbottom[0] + player.size[0] / 2, player.get_rect().midbottom[1])
-    p2 = (tube_list[score].get_rect().midtop[0] + Tube.size[0] / 2, tube_list[score].get_rect().midtop[1])
-    if show: pygame.draw.line(screen, RED, p1, p2, 2)
-    distances.append(distance_between_points(p1, p2))
-
-    # Line 8
-    p1 = (player.get_rect().midtop[0] + player.size[0] / 2, player.get_rect().midtop[1])
-    p2 = (tube_list[score].get_rect_reverse().midbottom[0] + Tube.size[0] / 2, tube_list[score].get_rect_reverse().midbottom[1])
-    if show: pygame.draw.line(screen, BLUE, p1, p2, 2)
-    distances.append(distance_between_points(p1, p2))
-
-    return distances
+
+    # Variabile for main function
+    world = World(160, course_seed)
+    tube_list = world.tube_list
+
+    # Create the population of birds and compile their networks
+    network = BatchNetwork.create(ge, config, network_cache)
+
+    flock = Flock(len(ge))
+    fitness = np.zeros(len(ge))  # start with fitness level of 0
+
+    # Episode budget: frames played, wall time and ground contacts of every bird since its last flap
+    frame = 0
+    start = time.perf_counter()
+    ground_contacts = np.zeros(len(ge), dtype=int)
+    if show:
+        renderer.invalidate()
+
+    recorder = None
+    if replay_path is not None:
+        recorder = ReplayRecorder(replay_path, len(ge), world.course.seed, tube_list.capacity)
+
+    while flock.alive.any():
+        timer.start_frame()
+
+        # Headless training runs with no frame cap, the physics always uses a fixed dt
+        # and the window is paced by the single clock.tick at the end of the frame
+        if show:
+            load_screen()
+            timer.mark('draw')
+
+        # Aggiornamento player e tubi, crea nuovi tubi
+        world.step([flock])
+        score = world.score
+        tube_index = world.tube_index
+        ground_contacts += flock.is_ground
+        timer.mark('update')
+
+        alive = np.flatnonzero(flock.alive)
+        n_birds = len(alive)
+        fitness[alive] += 0.1
+
+        # Get 8 size distance
+        distanze = flock.distances(tube_list[score])
+        timer.mark('sensors')
+        if show:
+            renderer.add(draw_sensor_lines(screen, flock.x[alive[:1]], flock.y[alive[:1]], tube_list[score]))
+            timer.mark('draw')
+
+        # Input for function activation
+        input_data = np.column_stack((
+            flock.x, flock.y, flock.jump_strength,
+            flock.gravity, flock.velocity_y,
+            distanze * 1.3
+        ))
+
+        flaps = np.zeros(len(flock), dtype=bool)
+        output = network.activate(input_data[alive], alive)
+        flaps[alive] = output[:, 0] > 0.995
+
+        if flaps.any():
+            call_flap_up(flock, flaps, show)
+            ground_contacts[flaps] = 0
+        timer.mark('activation')
+
+        # Disegna il tuboe e player sullo schermo
+        if show:
+            renderer.add(flock.draw(screen))
+
+            for tube in tube_list:
+                if not tube.offscreen():
+                    renderer.add(tube.draw(screen))
+            timer.mark('draw')
+
+        # Get of alive
+        dead = collidate_flock(flock, tube_list, tube_index)
+        fitness[dead] -= 3
+        flock.alive &= ~dead
+
+        # Passaggio del tubo, premia il primo uccello vivo
+        alive = np.flatnonzero(flock.alive)
+        if len(alive) > 0 and flock.x[alive[0]] > tube_list[score].position[0] + Tube.size[0]:
+            i = alive[0]
+            fitness[i] += 1
+            world.score += 1
+            score = world.score
+
+            if score%4 == 1:
+                increment_diff(flock, i, world)
+        timer.mark('collision')
+
+        # Update screen
+        if show:
+            update_text_screen(score, np.count_nonzero(flock.alive))
+            timer.mark('draw')
+            renderer.end_frame()
+            clock.tick(FPS)
+            timer.mark('flip')
+
+        if recorder is not None:
+            recorder.write(flock.x, flock.y, flock.velocity_y, flock.alive, flaps, tube_list, score)
+
+        timer.end_frame(n_birds)
+
+        # Stop the episode early when a limit of the budget is reached
+        frame += 1
+        if episode_budget is not None:
+            reason = episode_budget.exhausted(frame, world.score, time.perf_counter() - start,
+                                              ground_contacts[flock.alive])
+            if reason is not None:
+                print(f"Episode stopped after {frame} frames: {reason}")
+                episode_budget.settle(fitness, flock.alive, frame, reason)
+                break
+
+    if recorder is not None:
+        recorder.close()
+
+    return fitness
+
+
+def simulate_worlds(ge, config, course_seed=None):
+    """
+    Play one episode with every genome in its own world, all stepped together.
+
+    Every world has its own tubes and difficulty, so a bird passing a pipe only makes
+    its own world harder. All worlds use the same course, so fitness stays comparable.
+
+    Parameters:
+        - ge (list[neat.DefaultGenome]): The genomes to evaluate.
+        - config (neat.Config): The NEAT configuration.
+        - course_seed (int, optional): Seed of the pipe course, None for a random course.
+
+    Returns:
+        - np.ndarray: The fitness of every genome.
+    """
+    if course_seed is None:
+        course_seed = random.randrange(2 ** 32)
+
+    return simulate_worlds_courses(ge, config, [course_seed])[0]
+
+
+def simulate_worlds_courses(ge, config, course_seeds):
+    """
+    Play every genome on several courses at once, one world per genome and course, all stepped together.
+
+    Parameters:
+        - ge (list[neat.DefaultGenome]): The genomes to evaluate.
+        - config (neat.Config): The NEAT configuration.
+        - course_seeds (list[int]): Seeds of the pipe courses.
+
+    Returns:
+        - np.ndarray: The fitness of every genome on every course, of shape (len(course_seeds), len(ge)).
+    """
+    n_worlds = len(ge) * len(course_seeds)
+    env = FlippyVecEnv(n_worlds)
+    obs = env.reset([course_seed for course_seed in course_seeds for genome in ge])
+    network = BatchNetwork.create(ge * len(course_seeds), config, network_cache)
+
+    fitness = np.zeros(n_worlds)
+    done = np.zeros(n_worlds, dtype=bool)
+
+    # Episode budget: frames played, wall time and ground contacts of every bird since its last flap
+    frame = 0
+    start = time.perf_counter()
+    ground_contacts = np.zeros(n_worlds, dtype=int)
+
+    while not done.all():
+        timer.start_frame()
+
+        running = np.flatnonzero(~done)
+        flaps = np.zeros(n_worlds, dtype=bool)
+        flaps[running] = network.activate(obs[running], running)[:, 0] > 0.995
+        ground_contacts[flaps] = 0
+        timer.mark('activation')
+
+        obs, rewards, done, info = env.step(flaps)
+        fitness += rewards
+        ground_contacts += env.flock.is_ground
+        timer.mark('update')
+
+        timer.end_frame(len(running))
+
+        # Stop the episode early when a limit of the budget is reached
+        frame += 1
+        if episode_budget is not None:
+            reason = episode_budget.exhausted(frame, info['score'].max(), time.perf_counter() - start,
+                                              ground_contacts[~done])
+            if reason is not None:
+                print(f"Episode stopped after {frame} frames: {reason}")
+                episode_budget.settle(fitness, ~done, frame, reason)
+                break
+
+    max_score.append(int(info['score'].max()))
+    return fitness.reshape(len(course_seeds), len(ge))
+
+
+def play_episode(ge, config, course_seed=None, replay_path=None):
+    """
+    Play one episode in the shared world, or in one world per genome with multi_world.
+
+    Parameters:
+        - ge (list[neat.DefaultGenome]): The genomes to evaluate.
+        - config (neat.Config): The NEAT configuration.
+        - course_seed (int, optional): Seed of the pipe course, None for a random course.
+        - replay_path (str, optional): Record the shared-world episode to this replay file.
+
+    Returns:
+        - np.ndarray: The fitness of every genome.
+    """
+    if multi_world:
+        return simulate_worlds(ge, config, course_seed)
+    return simulate(ge, config, course_seed, not headless, replay_path)
+
+
+def replay_file(name):
+    """
+    Get the path of a replay in record_directory.
+
+    Parameters:
+        - name (str): Name of the episode.
+
+    Returns:
+        - str: The path of the replay file, None when not recording.
+    """
+    if record_directory is None:
+        return None
+    return os.path.join(record_directory, f'{name}.rpl')
+
+
+def simulate_cached(ge, config, course_seed=None, replay_path=None):
+    """
+    Play one episode, skipping the genomes whose fitness on this course is already in fitness_cache.
+
+    The cache is only enabled with multi_world, where the fitness of a genome does not depend on the others.
+
+    Parameters:
+        - ge (list[neat.DefaultGenome]): The genomes to evaluate.
+        - config (neat.Config): The NEAT configuration.
+        - course_seed (int, optional): Seed of the pipe course, None for a random course.
+        - replay_path (str, optional): Record the episode of the simulated genomes to this replay file.
+
+    Returns:
+        - np.ndarray: The fitness of every genome.
+    """
+    # Random courses never repeat, so there is nothing to reuse
+    if fitness_cache is None or course_seed is None:
+        return play_episode(ge, config, course_seed, replay_path)
+
+    cached = [fitness_cache.get(genome, course_seed) for genome in ge]
+    fitness = np.array([np.nan if value is None else value for value in cached])
+
+    missing = np.flatnonzero(np.isnan(fitness))
+    if len(missing) > 0:
+        fitness[missing] = play_episode([ge[i] for i in missing], config, course_seed, replay_path)
+        for i in missing:
+            fitness_cache.put(ge[i], course_seed, fitness[i])
+
+    return fitness
 
 
 def eval_genomes(genomes, config):
 
-    global int_try, v_delta, x_velocity
+    global int_try
 
     # Init start variable
     int_try += 1
-    v_delta = 160
-    x_velocity = 0
 
-    # Variabile for main function
-    score = 0       
-    tube_index = 0
-    tube_list = [Tube(v_delta, x_velocity)]
-
-    nets = []
-    ge = []
-    birds = []
-
-    # Create a list of birds
-    for genome_id, genome in genomes:
-        genome.fitness = 0  # start with fitness level of 0
-        net = neat.nn.FeedForwardNetwork.create(genome, config)
-        nets.append(net)
-        birds.append(Player())
-        ge.append(genome)
-
-    while len(birds) > 0:
-        dt = clock.tick(FPS) / 100
-        
-        # call_flap_up
-        load_screen()
-
-        # Aggiornamento player e tubi
-        for i, bird in enumerate(birds):
-            bird.update(dt)
+    # The course is replayable when a seed is set, fixed courses are the same every generation
+    ge = [genome for genome_id, genome in genomes]
+    if courses > 0:
+        base_seed = 0 if seed is None else seed
+        course_seeds = [base_seed + k for k in range(courses)]
+        aggregator = FitnessAggregator(len(ge), reducer)
+
+        # Without a cache, the worlds of every course are batched together with the population
+        if multi_world and fitness_cache is None:
+            for course_fitness in simulate_worlds_courses(ge, config, course_seeds):
+                aggregator.add(course_fitness)
+        else:
+            for k, course_seed in enumerate(course_seeds):
+                aggregator.add(simulate_cached(ge, config, course_seed, replay_file(f'generation-{int_try}-course-{k}')))
+
+        fitness = aggregator.result()
+    else:
+        fitness = simulate_cached(ge, config, None if seed is None else seed + int_try,
+                                  replay_file(f'generation-{int_try}'))
 
-        for tube in tube_list:
-            if not tube.offscreen():
-                tube.update(dt)
-
-        # Crea nuovi tubie
-        if tube_list[-1].position[0] < 400:
-            tube_list.append(Tube(v_delta, x_velocity))
-            tube_index += 1
-
-        for i, bird in enumerate(birds):
-            ge[i].fitness += 0.1
-            
-            # Get 8 size distance
-            if i == 0:
-                distanze = calculate_distances_and_draw_lines(bird, tube_list, score, True)
-            else:
-                distanze = calculate_distances_and_draw_lines(bird, tube_list, score)
-
-            # Input for function activation
-            input_data = input_data = [
-                bird.position[0], bird.position[1], bird.jump_strength, 
-                bird.gravity, bird.velocity_y,
-                distanze[0] * 1.3, distanze[1] * 1.3 , distanze[2] * 1.3 , distanze[3] * 1.3, distanze[4] * 1.3, distanze[5] * 1.3, distanze[6] * 1.3, distanze[7] * 1.3
-                #tube_list[score].position[0], tube_list[score].position[1] - 1, tube_list[score].velocity_y,
-                #tube_list[score].position_rotate[0], tube_list[score].position_rotate[1] + 1, tube_list[score].velocity_y,
-                #x_velocity
-            ]
-
-            output = nets[i].activate(input_data)
-
-            if output[0] > 0.995:
-                call_flap_up(bird)
+    for genome, genome_fitness in zip(ge, fitness):
+        genome.fitness = float(genome_fitness)
 
-        # Disegna il tuboe e player sullo schermo
-        for bird in birds:
-            bird.draw(screen)
+    if fitness_cache is not None:
+        print(f"Fitness cache: {fitness_cache}")
 
-        for tube in tube_list:
-            if not tube.offscreen():
-                tube.draw(screen)
-
-        for i, bird in enumerate(birds):
-
-            # Get of alive
-            is_alive = collidate_player(bird, tube_list, tube_index)
-            
-            if is_alive:
-                if bird.position[0] > tube_list[score].position[0] + Tube.size[0]:
-
-                    # Passaggio del tubo
-                    ge[i].fitness += 1
-                    score += 1
-
-                    if score%4 == 1:
-                        increment_diff(bird, tube_list)
-                        
-            else:
-                ge[i].fitness -= 3
-                nets.pop(i)
-                ge.pop(i)
-                birds.pop(i)
 
-        # Update screen
-        update_text_screen(score, len(birds))
-        pygame.display.flip()
-        clock.tick(FPS)
+def save_champion(winner, config, path):
+    """
+    Export the best genome for Champion, reporting instead of raising when it cannot be exported.
+
+    Args:
+        - winner (neat.DefaultGenome): The best genome.
+        - config (neat.Config): The NEAT configuration.
+        - path (str): Destination JSON file.
+    """
+    try:
+        export_champion(winner, config, path)
+        print(f"Champion network saved to {path}")
+    except ValueError as e:
+        print(f"Champion network not saved: {e}")
+
+
+def run(config_file, *, headless_mode=False, course_seed=None, workers=1, fixed_courses=0, telemetry=None,
+        keep_checkpoints=3, incremental_checkpoints=False, cache_fitness=0, budget=None, record=None,
+        worlds=False, course_reducer='mean', islands=None, migration_interval=10, migrants=2, island_stats=None,
+        champion=CHAMPION_FILE):
+    """
+    Train the NEAT population, resuming from CHECKPOINT_FILE when it exists.
 
+    Args:
+        - config_file (str): Path to the NEAT configuration file.
+        - headless_mode (bool): Skip the window, all drawing and the frame cap (default is False).
+        - course_seed (int, optional): Base seed of the pipe courses, None for random courses.
+        - workers (int, optional): Number of worker processes, more than one implies headless (default is 1).
+        - fixed_courses (int, optional): Average fitness over this many fixed courses, 0 for a new course every generation.
+        - telemetry (str, optional): CSV or JSON-lines file for per-generation timing records (default is None).
+        - keep_checkpoints (int, optional): Number of checkpoints kept on disk (default is 3).
+        - incremental_checkpoints (bool, optional): Store only the changed genomes between full checkpoints (default is False).
+        - cache_fitness (int, optional): Capacity of the fitness cache of seeded courses, 0 to simulate every genome,
+          only with worlds and without a max_seconds budget (default is 0).
+        - budget (EpisodeBudget, optional): Limits on the length of every episode, None to play until every bird dies.
+        - record (str, optional): Directory where the replay of every episode is written, not with workers (default is None).
+        - worlds (bool, optional): Every genome plays in its own world, implies headless (default is False).
+        - course_reducer (str, optional): How the fitness of the fixed courses is combined (default is 'mean').
+        - islands (list[dict], optional): Config overrides of every island, evolved in parallel processes, implies headless.
+          Not with workers, telemetry or record.
+        - migration_interval (int, optional): Generations between migrations of the islands (default is 10).
+        - migrants (int, optional): Number of genomes an island sends every migration (default is 2).
+        - island_stats (str, optional): JSON-lines file for the statistics of every island epoch (default is None).
+        - champion (str, optional): File where the best genome is exported for Champion (default is CHAMPION_FILE).
+
+    Raises:
+        - ValueError: If islands are combined with workers, telemetry or record, or the fitness cache is
+          used without worlds or with a max_seconds budget.
+    """
+    global headless, seed, courses, fitness_cache, episode_budget, record_directory, multi_world, reducer
+
+    # In the shared world the fitness of a bird depends on the other birds, and a wall-time
+    # cutoff depends on the machine, so only per-genome worlds give a fitness worth reusing
+    if cache_fitness > 0 and not worlds:
+        raise ValueError('--fitness-cache needs --multi-world')
+    if cache_fitness > 0 and budget is not None and budget.max_seconds is not None:
+        raise ValueError('--fitness-cache cannot be combined with --max-seconds')
+
+    headless = headless_mode or workers > 1 or worlds or islands is not None
+    multi_world = worlds
+    reducer = parse_reducer(course_reducer)
+    seed = course_seed
+    courses = fixed_courses
+    episode_budget = budget
+    record_directory = record
+    if cache_fitness > 0:
+        fitness_cache = FitnessCache(cache_fitness)
+
+    # Every island resumes from the checkpoint when it exists, the final checkpoint comes from the best island
+    if islands is not None:
+        if workers > 1 or telemetry is not None or record is not None:
+            raise ValueError('--islands cannot be combined with --workers, --telemetry or --record')
+        if os.path.exists(CHECKPOINT_FILE):
+            print(f"Every island resumes from {CHECKPOINT_FILE}")
+        model = IslandModel(config_file, islands, eval_genomes, migration_interval=migration_interval,
+                            migrants=migrants, checkpoint_prefix=f'{CHECKPOINT_FILE}-island', seed=seed,
+                            stats_file=island_stats,
+                            checkpoint=CHECKPOINT_FILE if os.path.exists(CHECKPOINT_FILE) else None,
+                            keep=keep_checkpoints, initializer=apply_settings, initargs=(episode_settings(),))
+        winner = model.run(999)
+        print('\nBest genome (island {}):\n{!s}'.format(model.best_island, winner))
+
+        checkpointer = AsyncCheckpointer(filename_prefix=CHECKPOINT_FILE, keep=keep_checkpoints)
+        model.save_checkpoint(checkpointer, CHECKPOINT_FILE)
+        checkpointer.close()
+
+        save_champion(winner, model.states[model.best_island][0], champion)
+        return
+
+    # The checkpoint is read and its networks compiled while the window and the config are set up
+    checkpoint = None
+    if os.path.exists(f'{CHECKPOINT_FILE}'):
+        checkpoint = AsyncCheckpointer.prefetch_checkpoint(f'{CHECKPOINT_FILE}', network_cache)
+
+    if not headless:
+        init_display()
 
-def run(config_file):
     config = neat.config.Config(neat.DefaultGenome, neat.DefaultReproduction,
                                 neat.DefaultSpeciesSet, neat.DefaultStagnation,
                                 config_file)
 
     # Check if the checkpoint file exists
-    if os.path.exists(f'{CHECKPOINT_FILE}'):
+    if checkpoint is not None:
         print(f"Resuming from {CHECKPOINT_FILE}")
-        p = neat.Checkpointer.restore_checkpoint(f'{CHECKPOINT_FILE}')
+        p = AsyncCheckpointer.population_from(checkpoint.result())
 
     else:
         print("CHECKPOINT FILE DONT EXIST")
@@ -354,21 +637,80 @@ def run(config_file):
     stats = neat.StatisticsReporter()
     p.add_reporter(stats)
 
-    # Add a custom checkpointer that always saves to the same file
-    checkpointer = neat.Checkpointer(generation_interval=5, filename_prefix=CHECKPOINT_FILE)
+    # Timing of every generation, frames are only counted when simulating in this process
+    if telemetry is not None:
+        timer.enabled = True
+        p.add_reporter(TelemetryReporter(timer, telemetry))
+
+    # Add a custom checkpointer that writes in the background and rotates its files
+    checkpointer = AsyncCheckpointer(generation_interval=5, filename_prefix=CHECKPOINT_FILE,
+                                     keep=keep_checkpoints, incremental=incremental_checkpoints)
     p.add_reporter(checkpointer)
 
     # Run for up to 50 generations
-    winner = p.run(eval_genomes, 999)
+    if workers > 1:
+        evaluator = FlockEvaluator(workers, simulate_worlds if multi_world else simulate, seed, courses, reducer,
+                                   fitness_cache, apply_settings, (episode_settings(),))
+        winner = p.run(evaluator.evaluate, 999)
+        evaluator.close()
+    else:
+        winner = p.run(eval_genomes, 999)
 
     # Show final stats
     print('\nBest genome:\n{!s}'.format(winner))
 
     # Save the final state
     checkpointer.save_checkpoint(config, p.population, p.species, 0)
+    checkpointer.close()
+
+    save_champion(winner, config, champion)
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Train Flippy Bird with NEAT')
+    parser.add_argument('--headless', action='store_true', help='train without a window, as fast as the CPU allows')
+    parser.add_argument('--seed', type=int, default=None, help='base seed of the pipe courses, for replayable runs')
+    parser.add_argument('--workers', type=int, default=1, help='number of worker processes, each playing a headless episode')
+    parser.add_argument('--courses', type=int, default=0, help='evaluate every generation on this many fixed courses')
+    parser.add_argument('--telemetry', default=None, help='write per-generation timings to this .csv or .jsonl file')
+    parser.add_argument('--keep-checkpoints', type=int, default=3, help='number of checkpoints kept on disk')
+    parser.add_argument('--incremental-checkpoints', action='store_true', help='store only the changed genomes between full checkpoints')
+    parser.add_argument('--fitness-cache', type=int, default=0, help='reuse the fitness of genomes on seeded courses, keeping up to this many entries')
+    parser.add_argument('--max-frames', type=int, default=None, help='stop every episode after this many frames')
+    parser.add_argument('--max-pipes', type=int, default=None, help='stop every episode after this many pipes')
+    parser.add_argument('--max-seconds', type=float, default=None, help='stop every episode after this many seconds of wall time')
+    parser.add_argument('--stuck-contacts', type=int, default=None, help='stop when every bird touched the ground this many times without flapping')
+    parser.add_argument('--extrapolate', action='store_true', help='scale the fitness of the survivors up to --max-frames instead of capping it')
+    parser.add_argument('--record', default=None, help='write the replay of every episode to this directory')
+    parser.add_argument('--multi-world', action='store_true', help='play every genome in its own world, with its own difficulty')
+    parser.add_argument('--reducer', default='mean', help='combine the fitness of the --courses with mean, min, max, median or q<quantile>')
+    parser.add_argument('--islands', type=int, default=0, help='evolve this many populations in parallel processes, with migration')
+    parser.add_argument('--island-config', action='append', default=[], help='config overrides of the next island, as key=value,key=value')
+    parser.add_argument('--migration-interval', type=int, default=10, help='generations between migrations of the islands')
+    parser.add_argument('--migrants', type=int, default=2, help='number of genomes an island sends every migration')
+    parser.add_argument('--island-stats', default=None, help='write the statistics of every island epoch to this .jsonl file')
+    parser.add_argument('--course-cache', default=None, help='keep the pipe courses in this directory, shared by workers and runs')
+    parser.add_argument('--champion', default=CHAMPION_FILE, help='export the best genome to this file, to play it without neat-python')
+    args = parser.parse_args()
+
+    # Islands without --island-config use config.txt as is
+    islands = None
+    if args.islands > 0 or args.island_config:
+        islands = [parse_overrides(text) for text in args.island_config]
+        islands += [{}] * (args.islands - len(islands))
+
+    if args.course_cache is not None:
+        cache_courses_on_disk(args.course_cache)
+
+    budget = None
+    if any(limit is not None for limit in (args.max_frames, args.max_pipes, args.max_seconds, args.stuck_contacts)):
+        budget = EpisodeBudget(args.max_frames, args.max_pipes, args.max_seconds, args.stuck_contacts, args.extrapolate)
+
     local_dir = os.path.dirname(__file__)
     config_path = os.path.join(local_dir, 'config.txt')
-    run(config_path)
+    run(config_path, headless_mode=args.headless, course_seed=args.seed, workers=args.workers,
+        fixed_courses=args.courses, telemetry=args.telemetry, keep_checkpoints=args.keep_checkpoints,
+        incremental_checkpoints=args.incremental_checkpoints, cache_fitness=args.fitness_cache, budget=budget,
+        record=args.record, worlds=args.multi_world, course_reducer=args.reducer, islands=islands,
+        migration_interval=args.migration_interval, migrants=args.migrants, island_stats=args.island_stats,
+        champion=args.champion)